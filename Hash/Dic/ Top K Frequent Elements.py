@@ -1,20 +1,177 @@
+import heapq
+import itertools
+import math
+import sys
+import time
+import tracemalloc
+from collections import Counter
+from typing import Hashable, Iterable, List, Tuple
+
+
 class Solution:
     def topKFrequent(self, nums: List[int], k: int) -> List[int]:
-        dic = {}
+        dic = Counter(nums)  # C-level counting loop
 
-        for num in nums:
-            if num in dic:
-                dic[num]+=1
-            else:
-                dic[num]=1
-        
-        print(dic)
-
-        sorted_tup = sorted(dic.items(), key = lambda x: x[1], reverse = True)
+        # bucket sort: bucket[c] holds the numbers seen exactly c times. O(n)
+        most = max(dic.values(), default=0)
+        bucket = [[] for _ in range(most + 1)]
+        for key, value in dic.items():
+            bucket[value].append(key)
         res = []
-        for key, value in sorted_tup[:k]:
-            res.append(key)
+        for count in range(most, 0, -1):
+            for key in bucket[count]:
+                res.append(key)
+                if len(res) == k:
+                    return res
         return res
 
+    def topKFrequentHeap(self, nums: List[int], k: int) -> List[int]:
+        # min-heap of size k over the counts: O(n log k) time, O(k) extra
+        dic = Counter(nums)
+        return [key for key, _ in heapq.nlargest(k, dic.items(), key=lambda x: x[1])]
+
+
+class SpaceSaving:
+    """
+    Streaming heavy hitters (Metwally et al.'s Space-Saving).
+
+    Monitors at most `capacity` keys. A new key that arrives when the table
+    is full replaces the key with the smallest count and inherits that
+    count, remembered as its possible overestimate (`error`). For a stream
+    of n items every count is within n / capacity of the true count, and
+    any key seen more than n / capacity times is guaranteed to be present.
+    So capacity = ceil(1 / epsilon) bounds the error to epsilon * n using
+    O(1 / epsilon) memory, whatever the number of distinct keys.
+
+    The min-count key is found with a heap holding one entry per monitored
+    key. Increments don't touch the heap; a popped entry whose count is
+    stale is pushed back with the current count. Counts only grow, so the
+    first fresh entry popped is the real minimum. Entries carry an
+    insertion number after the count, so ties never compare keys and any
+    mix of hashable keys works.
+    """
+
+    def __init__(self, capacity: int):
+        if capacity < 1:
+            raise ValueError("capacity must be >= 1")
+        self.capacity = capacity
+        self.counts = {}
+        self.errors = {}
+        self.heap = []  # (count when pushed, insertion number, key)
+        self.n = 0
+        self._seq = itertools.count()
+
+    @classmethod
+    def for_error(cls, epsilon: float) -> "SpaceSaving":
+        return cls(math.ceil(1 / epsilon))
+
+    def add(self, key: Hashable) -> None:
+        self.n += 1
+        counts = self.counts
+        if key in counts:
+            counts[key] += 1
+            return
+        if len(counts) < self.capacity:
+            counts[key] = 1
+            self.errors[key] = 0
+            heapq.heappush(self.heap, (1, next(self._seq), key))
+            return
+        heap = self.heap
+        while True:
+            count, seq, victim = heap[0]
+            if counts[victim] == count:
+                break
+            heapq.heapreplace(heap, (counts[victim], seq, victim))
+        del counts[victim], self.errors[victim]
+        counts[key] = count + 1
+        self.errors[key] = count
+        heapq.heapreplace(heap, (count + 1, next(self._seq), key))
+
+    def update(self, stream: Iterable) -> "SpaceSaving":
+        add = self.add
+        for key in stream:
+            add(key)
+        return self
+
+    def top(self, k: int) -> List[Tuple[Hashable, int, int]]:
+        """The k largest (key, estimated count, max overestimate), largest first."""
+        return [(key, count, self.errors[key])
+                for key, count in heapq.nlargest(k, self.counts.items(), key=lambda x: x[1])]
+
+    def __len__(self) -> int:
+        return len(self.counts)
+
+
+def top_k_frequent_stream(stream: Iterable, k: int, epsilon: float = 1e-3) -> List[Hashable]:
+    """Approximate topKFrequent over an iterator in O(1 / epsilon) memory."""
+    return [key for key, _, _ in SpaceSaving.for_error(max(epsilon, 1e-9)).update(stream).top(k)]
+
+
+def _top_k_sorted(nums: List[int], k: int) -> List[int]:
+    """The original full sort over every distinct item, for the benchmark."""
+    dic = Counter(nums)
+    return [key for key, _ in sorted(dic.items(), key=lambda x: x[1], reverse=True)[:k]]
+
+
+def benchmark_top_k(n: int = 1_000_000, distinct: int = 200_000, k: int = 10) -> None:
+    import random
+    rng = random.Random(0)
+    # Zipf-like ranks: a few heavy hitters over a long tail of distinct keys
+    weights = [1 / (rank + 1) ** 1.1 for rank in range(distinct)]
+    nums = rng.choices(range(distinct), weights=weights, k=n)
+    truth = set(_top_k_sorted(nums, k))
+
+    modes = [
+        ("full sort (old)", lambda: _top_k_sorted(nums, k)),
+        ("bucket", lambda: Solution().topKFrequent(nums, k)),
+        ("heap", lambda: Solution().topKFrequentHeap(nums, k)),
+    ]
+    for epsilon in (1e-3, 1e-4):
+        modes.append((f"space-saving eps={epsilon:g}",
+                      lambda epsilon=epsilon: top_k_frequent_stream(iter(nums), k, epsilon)))
+    for label, run in modes:
+        start = time.perf_counter()
+        got = run()
+        elapsed = time.perf_counter() - start
+        # separate pass: tracemalloc slows allocation-heavy code down
+        tracemalloc.start()
+        run()
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        print(f"  {label:>24}: {elapsed * 1e3:7.1f} ms | peak {peak / 1024:8.1f} KiB | "
+              f"recall {len(truth & set(got)) / k:.0%}")
+
+
+if __name__ == "__main__":
+    import random
+
+    assert Solution().topKFrequent([1, 1, 1, 2, 2, 3], 2) == [1, 2]
+    assert Solution().topKFrequent([1], 1) == [1]
+    assert sorted(Solution().topKFrequentHeap([1, 1, 1, 2, 2, 3], 2)) == [1, 2]
+
+    for _ in range(200):
+        nums = [int(random.paretovariate(1.2)) for _ in range(random.randrange(1, 400))]
+        counts = {}
+        for num in nums:
+            counts[num] = counts.get(num, 0) + 1
+        k = random.randrange(1, len(counts) + 1)
+        # Ties may be broken differently; the counts taken must match
+        expected = sorted(counts[x] for x in _top_k_sorted(nums, k))
+        assert sorted(counts[x] for x in Solution().topKFrequent(nums, k)) == expected
+        assert sorted(counts[x] for x in Solution().topKFrequentHeap(nums, k)) == expected
+
+        sketch = SpaceSaving(random.randrange(1, 20)).update(nums)
+        bound = len(nums) / sketch.capacity
+        assert len(sketch) <= sketch.capacity
+        for key, count, error in sketch.top(len(sketch)):
+            assert counts[key] <= count <= counts[key] + bound and count - error <= counts[key]
+        for key, count in counts.items():
+            assert count <= bound or key in sketch.counts
+
+    # Keys of types that don't order against each other
+    sketch = SpaceSaving(2).update([1, "a", (2,), None, 1, "a", 1])
+    assert sketch.top(1)[0][0] == 1
+    print("All tests passed!")
 
-        
\ No newline at end of file
+    if len(sys.argv) > 1 and sys.argv[1] == "bench":
+        benchmark_top_k()
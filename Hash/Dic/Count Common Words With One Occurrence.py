@@ -1,3 +1,13 @@
+import mmap
+import os
+import re
+import sys
+import time
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
+from typing import List, Optional, Set, Tuple
+
+
 class Solution:
     def countWords(self, words1: List[str], words2: List[str]) -> int:
         dic1={}
@@ -7,16 +17,175 @@ class Solution:
                 dic1[word]+=1
             else:
                 dic1[word]=1
-        
+
         for word in words2:
             if word in dic2:
                 dic2[word]+=1
             else:
-                dic2[word]=1       
+                dic2[word]=1
 
         count = 0
         for word in dic1:
             if dic1[word] == 1 and dic2.get(word,0)==1:
                 count+=1
         return count
-        
\ No newline at end of file
+
+
+# ============================================================================
+# Files: mmap + token-aligned chunks + process pool
+#
+# A file's words are whitespace-separated tokens (compared as bytes). Each
+# chunk is counted on its own, then reduced to two sets - every word, and
+# the words seen more than once - so no counts cross process boundaries
+# and merging is set algebra. Counts are pruned at two: a word only has to
+# be "more than once" to be out of the answer, so its exact count is never
+# needed again.
+# ============================================================================
+
+_WHITESPACE = re.compile(rb"\s")
+
+
+def chunk_bounds(path: str, chunk_size: int) -> List[Tuple[int, int]]:
+    """Split a file into ~chunk_size byte ranges that never cut a word."""
+    size = os.path.getsize(path)
+    if size == 0:
+        return []
+    bounds, start = [], 0
+    with open(path, "rb") as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+        while start < size:
+            end = start + chunk_size
+            if end >= size:
+                end = size
+            else:
+                # Move the cut forward to the next whitespace byte
+                match = _WHITESPACE.search(mm, end)
+                end = match.start() if match else size
+            bounds.append((start, end))
+            start = end
+    return bounds
+
+
+def _count_chunk(path: str, start: int, end: int) -> Tuple[Set[bytes], Set[bytes]]:
+    """(every word, words seen more than once) in file[start:end]."""
+    with open(path, "rb") as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+        counts = Counter(mm[start:end].split())
+    return set(counts), {word for word, count in counts.items() if count > 1}
+
+
+def _merge(seen: Set[bytes], many: Set[bytes], part: Tuple[Set[bytes], Set[bytes]]) -> None:
+    """Fold one chunk into the running sets in place. O(words in the chunk)"""
+    part_seen, part_many = part
+    many |= part_many
+    many |= part_seen & seen  # set & iterates over the smaller side
+    seen |= part_seen
+
+
+def words_seen_once(path: str, workers: Optional[int] = None, chunk_size: int = 64 << 20,
+                    pool: Optional[ProcessPoolExecutor] = None) -> Set[bytes]:
+    """The words that occur exactly once in the file at `path`."""
+    seen, many = set(), set()
+    bounds = chunk_bounds(path, chunk_size)
+    if not bounds:  # empty file
+        return seen - many
+    if len(bounds) <= 1 or (pool is None and workers == 1):  # not worth a process hop
+        parts = (_count_chunk(path, start, end) for start, end in bounds)
+        for part in parts:
+            _merge(seen, many, part)
+        return seen - many
+    own_pool = pool is None
+    pool = pool or ProcessPoolExecutor(workers)
+    try:
+        starts, ends = zip(*bounds)
+        for part in pool.map(_count_chunk, [path] * len(bounds), starts, ends):
+            _merge(seen, many, part)
+    finally:
+        if own_pool:
+            pool.shutdown()
+    return seen - many
+
+
+def count_words_files(path1: str, path2: str, workers: Optional[int] = None,
+                      chunk_size: int = 64 << 20) -> int:
+    """countWords for two word files of any size; memory is O(distinct words)."""
+    # Files of one chunk each are counted in-process: no pool start-up cost
+    if workers == 1 or max(os.path.getsize(path1), os.path.getsize(path2)) <= chunk_size:
+        once1 = words_seen_once(path1, 1, chunk_size)
+        return len(once1 & words_seen_once(path2, 1, chunk_size))
+    with ProcessPoolExecutor(workers) as pool:
+        once1 = words_seen_once(path1, chunk_size=chunk_size, pool=pool)
+        return len(once1 & words_seen_once(path2, chunk_size=chunk_size, pool=pool))
+
+
+def benchmark_count_words(words_per_file: int = 5_000_000, vocabulary: int = 200_000) -> None:
+    import random
+    import tempfile
+    rng = random.Random(0)
+    vocab = [f"w{i:x}" for i in range(vocabulary)]
+    with tempfile.TemporaryDirectory() as tmp:
+        paths = []
+        for name in ("a.txt", "b.txt"):
+            path = os.path.join(tmp, name)
+            with open(path, "w") as f:
+                for _ in range(words_per_file // 10_000):
+                    f.write(" ".join(rng.choices(vocab, k=10_000)))
+                    f.write("\n")
+            paths.append(path)
+        total_mb = sum(os.path.getsize(p) for p in paths) / 2**20
+
+        start = time.perf_counter()
+        lists = []
+        for path in paths:
+            with open(path) as f:
+                lists.append(f.read().split())
+        expected = Solution().countWords(*lists)
+        elapsed = time.perf_counter() - start
+        del lists
+        print(f"  read + countWords (1 process): {total_mb / elapsed:6.1f} MB/s")
+
+        for workers in (1, 2, 4):
+            start = time.perf_counter()
+            got = count_words_files(*paths, workers=workers, chunk_size=8 << 20)
+            elapsed = time.perf_counter() - start
+            assert got == expected
+            print(f"  count_words_files workers={workers}:   {total_mb / elapsed:6.1f} MB/s")
+        print(f"  ({total_mb:.0f} MB total, {os.cpu_count()} CPU(s))")
+
+
+if __name__ == "__main__":
+    import random
+    import tempfile
+
+    assert Solution().countWords(["leetcode", "is", "amazing", "as", "is"],
+                                 ["amazing", "leetcode", "is"]) == 2
+    assert Solution().countWords(["a", "ab"], ["a", "a", "a", "ab"]) == 1
+
+    with tempfile.TemporaryDirectory() as tmp:
+        for trial in range(20):
+            lists, paths = [], []
+            for side in range(2):
+                words = [f"w{random.randrange(60)}" for _ in range(random.randrange(300))]
+                path = os.path.join(tmp, f"{trial}-{side}.txt")
+                with open(path, "w") as f:
+                    for word in words:
+                        f.write(word + random.choice((" ", "\n", "\t ")))
+                lists.append(words)
+                paths.append(path)
+            expected = Solution().countWords(*lists)
+            for chunk_size in (1, 7, 64 << 20):
+                assert count_words_files(*paths, workers=1, chunk_size=chunk_size) == expected
+            if trial < 2:
+                assert count_words_files(*paths, workers=2, chunk_size=16) == expected
+            if trial < 2:
+                with ProcessPoolExecutor(2) as pool:
+                    assert words_seen_once(paths[0], chunk_size=1 << 20, pool=pool) == \
+                        words_seen_once(paths[0], workers=1)
+
+        empty = os.path.join(tmp, "empty.txt")
+        open(empty, "w").close()
+        assert words_seen_once(empty) == set()
+        assert count_words_files(empty, paths[0]) == 0
+        assert count_words_files(empty, empty, workers=1) == 0
+    print("All tests passed!")
+
+    if len(sys.argv) > 1 and sys.argv[1] == "bench":
+        benchmark_count_words()
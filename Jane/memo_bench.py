@@ -0,0 +1,301 @@
+"""
+Trace-driven benchmark suite for the memoization strategies in que-linked.py
+
+Replays key traces through memo_basic / memo_fifo / memo_lru (and, via
+"lru-<policy>", any eviction policy) across a sweep of cache sizes, and
+reports for every (strategy, trace, size):
+- hit ratio
+- ns/op for hits and for misses (per-call timing, timer cost subtracted;
+  the fastest of --repeats replays, since noise only ever adds time)
+- peak memory of the replay (tracemalloc, measured in a separate pass so
+  it doesn't distort the timings)
+
+Traces:
+- synthetic: uniform, zipf-<skew> (e.g. zipf-0.8), scan (sequential keys
+  that never repeat), loop (cycling over a key range larger than most sizes)
+- recorded: any file path - text with one integer key per line, or raw
+  little-endian int64 keys if the file ends in .bin
+
+Results are written as JSON so runs can be diffed; --baseline compares the
+current run against an earlier JSON file and flags regressions. Hit ratio
+and peak memory are deterministic and use the tight --tolerance; ns/op
+uses the looser --time-tolerance.
+
+Usage:
+    python memo_bench.py                          # default sweep, table only
+    python memo_bench.py --output run.json
+    python memo_bench.py --traces zipf-1.0 recorded.txt --sizes 64 1024
+    python memo_bench.py --baseline old.json --output new.json
+    python memo_bench.py --baseline old.json --repeats 7 --time-tolerance 0.5
+
+The default --time-tolerance of 0.5 suits a quiet machine. On a shared or
+single-CPU host, separate runs can differ by up to ~2x on the fastest
+(~100 ns) rows even as a min over repeats; use --time-tolerance 1.0 there.
+"""
+
+import argparse
+import importlib.util
+import json
+import os
+import platform
+import random
+import sys
+import time
+import tracemalloc
+from array import array
+from typing import Callable, Dict, List, Optional, Tuple
+
+
+def _load_memo_module():
+    """que-linked.py isn't importable by name (hyphen), so load it by path."""
+    path = os.path.join(os.path.dirname(os.path.abspath(__file__)), "que-linked.py")
+    spec = importlib.util.spec_from_file_location("que_linked", path)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+memo = _load_memo_module()
+
+
+# ============================================================================
+# Traces
+# ============================================================================
+
+def uniform_trace(length: int, num_keys: int, seed: int = 0) -> List[int]:
+    rng = random.Random(seed)
+    return [rng.randrange(num_keys) for _ in range(length)]
+
+
+def scan_trace(length: int) -> List[int]:
+    """Every key is new - the worst case for every cache."""
+    return list(range(length))
+
+
+def loop_trace(length: int, loop_len: int) -> List[int]:
+    """0, 1, ..., loop_len-1, 0, 1, ... - pathological for LRU below loop_len."""
+    return [i % loop_len for i in range(length)]
+
+
+def load_trace(path: str) -> List[int]:
+    """Recorded trace: one int per line, or raw int64 keys for *.bin files."""
+    if path.endswith(".bin"):
+        keys = array("q")
+        with open(path, "rb") as f:
+            keys.frombytes(f.read())
+        if sys.byteorder != "little":
+            keys.byteswap()
+        return keys.tolist()
+    with open(path) as f:
+        return [int(line) for line in f if line.strip()]
+
+
+def make_trace(name: str, length: int, num_keys: int) -> List[int]:
+    if name == "uniform":
+        return uniform_trace(length, num_keys)
+    if name.startswith("zipf-"):
+        return memo.zipf_trace(length, num_keys, skew=float(name[len("zipf-"):]))
+    if name == "scan":
+        return scan_trace(length)
+    if name == "loop":
+        return loop_trace(length, num_keys // 2)
+    if os.path.exists(name):
+        return load_trace(name)
+    raise ValueError(f"unknown trace {name!r} (not a synthetic trace name or a file)")
+
+
+# ============================================================================
+# Strategies
+# ============================================================================
+
+def make_memo(strategy: str, f: Callable[[int], int], size: int) -> Callable[[int], int]:
+    if strategy == "basic":
+        return memo.memo_basic(f)
+    if strategy == "fifo":
+        return memo.memo_fifo(f, max_size=size)
+    if strategy == "lru":
+        return memo.memo_lru(f, max_size=size)
+    if strategy.startswith("lru-"):
+        return memo.memo_lru(f, max_size=size, policy=strategy[len("lru-"):])
+    raise ValueError(f"unknown strategy {strategy!r}")
+
+
+# ============================================================================
+# Replay
+# ============================================================================
+
+def _timer_overhead_ns(samples: int = 100_000) -> float:
+    """Median cost of an empty timed region, subtracted from per-call timings."""
+    clock = time.perf_counter_ns
+    timings = []
+    for _ in range(samples):
+        start = clock()
+        timings.append(clock() - start)
+    timings.sort()
+    return timings[len(timings) // 2]
+
+
+def _timed_replay(strategy: str, trace: List[int], size: int) -> Tuple[int, int, int]:
+    """One replay through a fresh cache: (misses, total hit ns, total miss ns)."""
+    misses = 0
+
+    def f(x: int) -> int:
+        nonlocal misses
+        misses += 1
+        return x * x
+
+    memoized = make_memo(strategy, f, size)
+    clock = time.perf_counter_ns
+    hit_ns = miss_ns = 0
+    for key in trace:
+        before = misses
+        start = clock()
+        memoized(key)
+        elapsed = clock() - start
+        if misses == before:
+            hit_ns += elapsed
+        else:
+            miss_ns += elapsed
+    return misses, hit_ns, miss_ns
+
+
+def _peak_bytes(strategy: str, trace: List[int], size: int) -> int:
+    """Peak traced memory of one replay (a separate pass: tracemalloc is slow)."""
+    tracemalloc.start()
+    memoized = make_memo(strategy, lambda x: x * x, size)
+    for key in trace:
+        memoized(key)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return peak
+
+
+def _summarize(trace: List[int], best: Tuple[int, int, int], peak: int, overhead_ns: float) -> Dict[str, float]:
+    misses, hit_ns, miss_ns = best
+    hits = len(trace) - misses
+    return {
+        "hit_ratio": hits / len(trace) if trace else 0.0,
+        "hit_ns": max(0.0, hit_ns / hits - overhead_ns) if hits else None,
+        "miss_ns": max(0.0, miss_ns / misses - overhead_ns) if misses else None,
+        "peak_bytes": peak,
+    }
+
+
+def _fastest(runs: List[Tuple[int, int, int]]) -> Tuple[int, int, int]:
+    """Fastest hit and miss totals over replays. Every replay starts cold,
+    so the hit/miss counts are the same in all of them."""
+    return runs[0][0], min(run[1] for run in runs), min(run[2] for run in runs)
+
+
+def run_suite(strategies: List[str], traces: List[str], sizes: List[int],
+              length: int, num_keys: int, repeats: int = 3) -> dict:
+    overhead_ns = _timer_overhead_ns()
+    trace_data = {name: make_trace(name, length, num_keys) for name in traces}
+    # memo_basic is unbounded: one row, size recorded as null
+    cells = [(trace_name, strategy, size) for trace_name in traces for strategy in strategies
+             for size in ([None] if strategy == "basic" else sizes)]
+    # Each repeat sweeps every cell before the next one starts, instead of
+    # replaying a cell back to back, so a slow spell on the machine spoils
+    # one replay of a cell rather than all of them
+    runs = {cell: [] for cell in cells}
+    results = []
+    repeats = max(1, repeats)
+    for repeat in range(repeats):
+        for cell in cells:
+            trace_name, strategy, size = cell
+            trace = trace_data[trace_name]
+            runs[cell].append(_timed_replay(strategy, trace, size))
+            if repeat == repeats - 1:
+                row = {"strategy": strategy, "trace": trace_name, "size": size, "ops": len(trace),
+                       **_summarize(trace, _fastest(runs[cell]), _peak_bytes(strategy, trace, size),
+                                    overhead_ns)}
+                results.append(row)
+                print(_format_row(row))
+    return {
+        "meta": {
+            "python": platform.python_version(),
+            "implementation": platform.python_implementation(),
+            "machine": platform.machine(),
+            "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+            "length": length,
+            "num_keys": num_keys,
+            "repeats": repeats,
+            "timer_overhead_ns": overhead_ns,
+        },
+        "results": results,
+    }
+
+
+# ============================================================================
+# Reporting
+# ============================================================================
+
+def _fmt_ns(ns: Optional[float]) -> str:
+    return "     -" if ns is None else f"{ns:6.0f}"
+
+
+def _format_row(row: dict) -> str:
+    size = "inf" if row["size"] is None else row["size"]
+    return (f"  {row['trace']:>10} | {row['strategy']:>11} | size {size:>6} | "
+            f"hit {row['hit_ratio']:6.2%} | hit {_fmt_ns(row['hit_ns'])} ns | "
+            f"miss {_fmt_ns(row['miss_ns'])} ns | peak {row['peak_bytes'] / 1024:8.1f} KiB")
+
+
+def compare(baseline: dict, current: dict, tolerance: float = 0.10,
+            time_tolerance: float = 0.50) -> List[str]:
+    """
+    Flag rows whose hit ratio dropped or whose peak memory grew by more
+    than `tolerance`, or whose ns/op grew by more than `time_tolerance`,
+    relative to the baseline run. Timings are noisy even as a min over
+    repeats, so they get the looser threshold.
+    """
+    key = lambda r: (r["strategy"], r["trace"], r["size"])
+    old = {key(r): r for r in baseline["results"]}
+    regressions = []
+    for row in current["results"]:
+        prev = old.get(key(row))
+        if prev is None:
+            continue
+        if row["hit_ratio"] < prev["hit_ratio"] - tolerance * max(prev["hit_ratio"], 1e-9):
+            regressions.append(f"{key(row)} hit_ratio {prev['hit_ratio']:.4f} -> {row['hit_ratio']:.4f}")
+        for metric, limit in (("hit_ns", time_tolerance), ("miss_ns", time_tolerance),
+                              ("peak_bytes", tolerance)):
+            if prev[metric] and row[metric] and row[metric] > prev[metric] * (1 + limit):
+                regressions.append(f"{key(row)} {metric} {prev[metric]:.0f} -> {row[metric]:.0f}")
+    return regressions
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--strategies", nargs="+", default=["basic", "fifo", "lru"])
+    parser.add_argument("--traces", nargs="+",
+                        default=["uniform", "zipf-0.6", "zipf-0.8", "zipf-1.0", "zipf-1.2", "scan", "loop"])
+    parser.add_argument("--sizes", nargs="+", type=int, default=[16, 256, 4096])
+    parser.add_argument("--length", type=int, default=100_000, help="synthetic trace length")
+    parser.add_argument("--num-keys", type=int, default=10_000, help="synthetic key space")
+    parser.add_argument("--output", help="write results JSON here")
+    parser.add_argument("--baseline", help="earlier results JSON to check for regressions")
+    parser.add_argument("--repeats", type=int, default=3,
+                        help="timed replays per row; the fastest is reported")
+    parser.add_argument("--tolerance", type=float, default=0.10,
+                        help="allowed relative change in hit ratio and peak memory")
+    parser.add_argument("--time-tolerance", type=float, default=0.50,
+                        help="allowed relative growth in hit/miss ns per op")
+    args = parser.parse_args(argv)
+
+    report = run_suite(args.strategies, args.traces, args.sizes, args.length, args.num_keys,
+                       args.repeats)
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(report, f, indent=2)
+    if args.baseline:
+        with open(args.baseline) as f:
+            regressions = compare(json.load(f), report, args.tolerance, args.time_tolerance)
+        for line in regressions:
+            print(f"REGRESSION {line}")
+        return 1 if regressions else 0
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -5,10 +5,47 @@ This demonstrates three levels of memoization:
 1. Basic memoization with hash table
 2. FIFO eviction with O(1) complexity
 3. LRU eviction with O(1) complexity using doubly-linked list
+
+Extensions for production use follow in later parts:
+4. Thread-safe, lock-striped (sharded) LRU
+5. Compact array-backed LRU (no per-entry Node objects)
+6. Single-flight miss coalescing
+7. Async memoization for coroutine functions
+8. Pluggable eviction policies: LFU, ARC, W-TinyLFU
+9. Weight- and TTL-bounded caches
+10. Persistent, memory-mapped second-tier (L2) cache
+11. Cross-process shared-memory cache for process pools
+12. Opt-in instrumentation: counters, latency histograms, export hook
+13. Batch API: get_many / put_many / memoized.map
+
+Run `python que-linked.py bench` to run the benchmarks instead of the demo,
+and `python memo_bench.py` for the trace-driven benchmark suite.
 """
 
-from collections import deque
-from typing import Callable, Any, Optional
+import asyncio
+import atexit
+import functools
+import marshal
+import mmap
+import multiprocessing
+import os
+import pickle
+import random
+import struct
+import sys
+import tempfile
+import threading
+import time
+import tracemalloc
+from array import array
+from collections import OrderedDict, deque, namedtuple
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import resource_tracker, shared_memory
+from typing import Awaitable, Callable, Any, Iterable, Optional, List, Tuple
+
+
+# Sentinel for cache lookups, so that None (or any other value) can be cached
+_MISSING = object()
 
 
 # ============================================================================
@@ -38,7 +75,13 @@ def memo_basic(f: Callable[[int], int]) -> Callable[[int], int]:
 # PART 2: FIFO Eviction with O(1) Complexity
 # ============================================================================
 
-def memo_fifo(f: Callable[[int], int], max_size: int = 256) -> Callable[[int], int]:
+def memo_fifo(f: Callable[[int], int], max_size: int = 256,
+              max_weight: Optional[int] = None,
+              weigher: Optional[Callable[[Any], int]] = None,
+              ttl: Optional[float] = None,
+              stats: bool = False,
+              stats_export: Optional[Callable[[dict], None]] = None,
+              export_interval: float = 60.0) -> Callable[[int], int]:
     """
     Memoization with FIFO (First In First Out) eviction policy.
     
@@ -53,7 +96,34 @@ def memo_fifo(f: Callable[[int], int], max_size: int = 256) -> Callable[[int], i
     - Simple to implement
     - Doesn't consider usage patterns
     - May evict frequently used items
+    
+    max_weight / weigher / ttl switch to a BoundedCache in FIFO mode
+    (see PART 9): eviction by total weight and lazy per-entry expiry.
+    stats=True adds cache_info()/snapshot() and an optional periodic
+    stats_export hook (see PART 12).
     """
+    if max_weight is not None or ttl is not None or stats:
+        if max_weight is not None or ttl is not None:
+            fifo_cache = BoundedCache(max_size, max_weight, weigher, ttl, fifo=True)
+        else:
+            fifo_cache = FIFOCache(max_size)
+        lookup, store = _cache_accessors(fifo_cache, None, None)
+        stats_obj = CacheStats(max_size, [fifo_cache]) if stats else None
+        if stats_obj is not None:
+            f = stats_obj.timed(f)
+        
+        def bounded_memoized(x: int) -> int:
+            cached_result = lookup(x)
+            if cached_result is not _MISSING:
+                return cached_result
+            result = f(x)
+            store(x, result)
+            return result
+        
+        if stats_obj is not None:
+            return stats_obj.wrap(bounded_memoized, stats_export, export_interval)
+        return bounded_memoized
+    
     cache = {}
     order_queue = deque()
     
@@ -109,9 +179,11 @@ class LRUCache:
     - put(): O(1) - add to hash table and head, evict tail if needed
     """
     
-    def __init__(self, capacity: int):
+    def __init__(self, capacity: int, on_evict: Optional[Callable[[int, int], None]] = None):
         self.capacity = capacity
         self.cache = {}  # key -> Node
+        self.on_evict = on_evict  # called as on_evict(key, value) on LRU eviction
+        self.evictions = 0  # entries dropped to make room (not updates)
         
         # Dummy head and tail nodes simplify operations
         self.head = Node(0, 0)  # Most recently used
@@ -138,10 +210,10 @@ class LRUCache:
         self._remove(node)
         self._add_to_head(node)
     
-    def get(self, key: int) -> Optional[int]:
-        """Get value and mark as recently used. O(1)"""
+    def get(self, key: int, default: Any = None) -> Optional[int]:
+        """Get value and mark as recently used, or default if absent. O(1)"""
         if key not in self.cache:
-            return None
+            return default
         
         node = self.cache[key]
         self._move_to_head(node)  # Update recency
@@ -166,9 +238,94 @@ class LRUCache:
                 lru_node = self.tail.prev
                 self._remove(lru_node)
                 del self.cache[lru_node.key]
+                self.evictions += 1
+                if self.on_evict is not None:
+                    self.on_evict(lru_node.key, lru_node.value)
+    
+    def _splice_at_head(self, nodes: Iterable[Node]) -> None:
+        """Link already-unlinked nodes at the head, the last one most recent. O(k)"""
+        first = self.head.next
+        nxt = first
+        for node in nodes:
+            node.next = nxt
+            nxt.prev = node
+            nxt = node
+        self.head.next = nxt
+        nxt.prev = self.head
+    
+    def get_many(self, keys: Iterable[int], default: Any = None) -> List[Any]:
+        """
+        Batch get: one dict lookup per key, hits relinked in a single splice.
+        
+        Equivalent to [get(k, default) for k in keys], including the final
+        recency order. O(k)
+        """
+        cache = self.cache
+        results, hit_nodes = [], {}
+        for key in keys:
+            node = cache.get(key)
+            if node is None:
+                results.append(default)
+                continue
+            if hit_nodes.pop(key, None) is None:
+                self._remove(node)
+            hit_nodes[key] = node
+            results.append(node.value)
+        self._splice_at_head(hit_nodes.values())
+        return results
+    
+    def put_many(self, items: Iterable[Tuple[int, Any]]) -> None:
+        """
+        Batch put: relink the whole batch once, then evict the overflow in
+        one sweep from the tail.
+        
+        Leaves the same contents and recency order as calling put() for
+        each (key, value) in order; a key that those puts would evict and
+        re-insert within the batch is simply never evicted. O(k)
+        """
+        cache = self.cache
+        batch = {}  # key -> node, least to most recent
+        for key, value in items:
+            node = batch.pop(key, None)
+            if node is None:
+                node = cache.get(key)
+                if node is None:
+                    node = cache[key] = Node(key, value)
+                else:
+                    self._remove(node)
+            node.value = value
+            batch[key] = node
+        self._splice_at_head(batch.values())
+        
+        overflow = len(cache) - self.capacity
+        if overflow > 0:
+            self.evictions += overflow
+            node = self.tail.prev
+            for _ in range(overflow):
+                del cache[node.key]
+                if self.on_evict is not None:
+                    self.on_evict(node.key, node.value)
+                node = node.prev
+            node.next = self.tail
+            self.tail.prev = node
+    
+    def __len__(self) -> int:
+        return len(self.cache)
 
 
-def memo_lru(f: Callable[[int], int], max_size: int = 256) -> Callable[[int], int]:
+def memo_lru(f: Callable[[int], int], max_size: int = 256,
+             shards: int = 16, thread_safe: bool = False,
+             compact: bool = False,
+             max_negative: Optional[int] = None,
+             policy: str = "lru",
+             max_weight: Optional[int] = None,
+             weigher: Optional[Callable[[Any], int]] = None,
+             ttl: Optional[float] = None,
+             l2_path: Optional[str] = None,
+             l2_preload: int = 1024,
+             stats: bool = False,
+             stats_export: Optional[Callable[[dict], None]] = None,
+             export_interval: float = 60.0) -> Callable[[int], int]:
     """
     Memoization with LRU (Least Recently Used) eviction policy.
     
@@ -184,23 +341,1593 @@ def memo_lru(f: Callable[[int], int], max_size: int = 256) -> Callable[[int], in
     - Evicts least recently used items (better than FIFO)
     - All operations are O(1) (better than O(n) linear scan or O(log n) heap)
     - Adapts to usage patterns
+    
+    Concurrency:
+    - thread_safe=True backs the wrapper with a ShardedLRUCache so it can be
+      shared across worker threads; `shards` sets the number of lock stripes
+      (default 16, as in ShardedLRUCache; shards=1 is a single global lock;
+      at most max_size). Ignored when thread_safe=False.
+    - With thread_safe=True, concurrent misses on the same key are coalesced
+      (single-flight): one thread calls f, the others wait and share it.
+    
+    Memory:
+    - compact=True stores entries in a CompactLRUCache (array-backed links,
+      no Node object per entry). Same O(1) behavior, about 20% less memory
+      per entry, slower get/put (see PART 5).
+    
+    Negative caching:
+    - Lookups use a sentinel, so a cached None is a hit like any other value
+    - max_negative=N keeps None results in a separate LRU of N entries, so
+      they can't crowd out real results; max_negative=0 never caches None
+    
+    Eviction policy:
+    - policy="lru" (default), "fifo", "lfu", "arc" or "tinylfu" swaps the
+      cache behind the wrapper without changing callers (see PART 8)
+    
+    Weight and TTL:
+    - max_weight bounds the summed weigher(value) of all entries (default
+      weigher: sys.getsizeof); ttl expires entries lazily (see PART 9)
+    
+    Persistence:
+    - l2_path adds an on-disk second tier (see PART 10): evictions spill to
+      it, misses check it before calling f, and up to l2_preload of the
+      hottest keys are loaded back at startup. memoized.close() (also run
+      at exit) persists the in-memory entries for the next warm start.
+    
+    Metrics:
+    - stats=True adds memoized.cache_info() / memoized.snapshot() (hits,
+      misses, evictions, size, weight, f latency histogram) and calls
+      stats_export(snapshot) every export_interval seconds if given (see
+      PART 12). With stats=False the wrapper is unchanged - zero overhead.
+    
+    Batches:
+    - memoized.map(xs, batch_f=None) resolves a whole batch at once: hits
+      in one pass, misses deduplicated and computed together (see PART 13)
     """
-    lru_cache = LRUCache(max_size)
+    shards = max(1, min(shards, max_size)) if thread_safe else 1  # as ShardedLRUCache clamps
+    cache_cls = _cache_factory(policy, compact, max_weight, weigher, ttl, shards)
     
-    def memoized(x: int) -> int:
-        # Try to get from cache
-        cached_result = lru_cache.get(x)
-        if cached_result is not None:
+    def make_cache(capacity: int):
+        if thread_safe:
+            return ShardedLRUCache(capacity, shards, cache_cls=cache_cls)
+        return cache_cls(capacity)
+    
+    if l2_path is not None:
+        if thread_safe or cache_cls is not LRUCache:
+            raise ValueError("l2_path requires the default single-threaded LRUCache")
+        main_cache = TieredCache(max_size, DiskTier(l2_path), preload=l2_preload)
+        atexit.register(main_cache.close)
+    else:
+        main_cache = make_cache(max_size)
+    
+    negative_cache = make_cache(max_negative) if max_negative else None
+    lookup, store = _cache_accessors(main_cache, negative_cache, max_negative)
+    
+    stats_obj = None
+    if stats:
+        stats_obj = CacheStats(max_size, [c for c in (main_cache, negative_cache) if c is not None])
+        f = stats_obj.timed(f)
+    
+    if not thread_safe:
+        def memoized(x: int) -> int:
+            # Try to get from cache
+            cached_result = lookup(x)
+            if cached_result is not _MISSING:
+                return cached_result
+            
+            # Cache miss - compute and store
+            result = f(x)
+            store(x, result)
+            return result
+    else:
+        flight = SingleFlight()
+        
+        def compute(x: int) -> int:
+            # Re-check: a previous flight for x may have landed since our miss
+            cached_result = lookup(x)
+            if cached_result is not _MISSING:
+                return cached_result
+            result = f(x)
+            store(x, result)
+            return result
+        
+        def memoized(x: int) -> int:
+            cached_result = lookup(x)
+            if cached_result is not _MISSING:
+                return cached_result
+            return flight.do(x, compute)
+    
+    if stats_obj is not None:
+        memoized = stats_obj.wrap(memoized, stats_export, export_interval)
+    memoized.map = _batch_map(f, main_cache, lookup, store, negative_cache is None, stats_obj)
+    if l2_path is not None:
+        memoized.close = main_cache.close
+    return memoized
+
+
+def _cache_accessors(cache, negative_cache, max_negative: Optional[int]):
+    """
+    Build sentinel-based lookup(x) / store(x, result) over a cache.
+    
+    lookup returns _MISSING on a miss. None results go to negative_cache
+    when max_negative is set (and are dropped when it is 0).
+    """
+    def lookup(x: int) -> Any:
+        result = cache.get(x, _MISSING)
+        if result is _MISSING and negative_cache is not None:
+            if negative_cache.get(x, _MISSING) is None:
+                return None
+        return result
+    
+    def store(x: int, result: Any) -> None:
+        if result is not None or max_negative is None:
+            cache.put(x, result)
+        elif negative_cache is not None:
+            negative_cache.put(x, result)
+    
+    return lookup, store
+
+
+# ============================================================================
+# PART 4: Thread-Safe Sharded LRU (lock striping)
+# ============================================================================
+
+class ShardedLRUCache:
+    """
+    Thread-safe LRU cache built from N independent LRUCache shards.
+    
+    Strategy:
+    - hash(key) % N picks the shard; each shard has its own lock
+    - Threads touching different shards never wait on each other, so a hit
+      only serializes with other operations on the same shard
+    - Each shard evicts its own LRU entry, so recency is exact per shard and
+      approximate across the whole cache
+    
+    Time: O(1) for get/put (plus one uncontended lock acquire)
+    Space: O(capacity) - capacity is split across shards (floor, plus one
+    for the first capacity % N shards), so the shards never hold more than
+    capacity entries together. More shards than capacity are clamped to
+    capacity.
+    
+    Trade-offs:
+    - A skewed key distribution can fill one shard while others sit idle
+    - Under the CPython GIL only the lock contention shrinks; hit throughput
+      scales with threads on free-threaded builds
+    """
+    
+    def __init__(self, capacity: int, shards: int = 16, cache_cls: type = None):
+        if shards < 1:
+            raise ValueError("shards must be >= 1")
+        cache_cls = cache_cls or LRUCache
+        self.capacity = capacity
+        shards = max(1, min(shards, capacity))
+        base, extra = divmod(capacity, shards)
+        self.shards = [cache_cls(base + (i < extra)) for i in range(shards)]
+        self.locks = [threading.Lock() for _ in range(shards)]
+    
+    def _shard_index(self, key: int) -> int:
+        return hash(key) % len(self.shards)
+    
+    def get(self, key: int, default: Any = None) -> Optional[int]:
+        """Get value and mark as recently used within its shard. O(1)"""
+        i = self._shard_index(key)
+        with self.locks[i]:
+            return self.shards[i].get(key, default)
+    
+    def put(self, key: int, value: int) -> None:
+        """Add/update key-value pair in its shard. O(1)"""
+        i = self._shard_index(key)
+        with self.locks[i]:
+            self.shards[i].put(key, value)
+    
+    @property
+    def evictions(self) -> int:
+        return sum(shard.evictions for shard in self.shards)
+    
+    @property
+    def weight(self) -> int:
+        """Summed weight of all shards (0 unless they are BoundedCaches)."""
+        return sum(getattr(shard, "weight", 0) for shard in self.shards)
+    
+    def __len__(self) -> int:
+        return sum(len(shard) for shard in self.shards)
+
+
+# ============================================================================
+# PART 5: Compact Array-Backed LRU (no per-entry Node objects)
+# ============================================================================
+
+class CompactLRUCache:
+    """
+    LRU Cache with recency links stored in preallocated integer arrays.
+    
+    Every entry lives in a numbered slot instead of a Node object:
+    - cache: {key -> slot}
+    - keys[slot], values[slot]: the entry itself
+    - prev[slot], next[slot]: recency links as array('l') indices
+    - Slot 0 is the sentinel of a circular list: next[0] is the most recently
+      used slot, prev[0] the least recently used
+    
+    Freed slots are pushed onto a free-list threaded through `next`, so slots
+    are reused and nothing is allocated per entry after warm-up.
+    
+    Operations:
+    - get(): O(1) - lookup slot, relink at head
+    - put(): O(1) - reuse a free (or the evicted LRU) slot, link at head
+    
+    Same API as LRUCache, trading speed for memory: benchmark_lru_memory
+    measures ~149 B/entry against LRUCache's ~188 (int keys and values,
+    the value ints included), about 20% less, while get/put run about
+    1.4-1.7x slower because every relink indexes the arrays instead of
+    setting node attributes.
+    """
+    
+    def __init__(self, capacity: int):
+        if capacity < 1:
+            raise ValueError("capacity must be >= 1")
+        self.capacity = capacity
+        n = capacity + 1  # + sentinel slot 0
+        self.cache = {}  # key -> slot
+        self.keys: List[Any] = [None] * n
+        self.values: List[Any] = [None] * n
+        self.prev = array('l', bytes(n * array('l').itemsize))
+        self.next = array('l', bytes(n * array('l').itemsize))
+        self._free = 0        # head of the free-list (0 = empty)
+        self._high_water = 1  # first never-used slot
+        self.evictions = 0
+    
+    def _unlink(self, slot: int) -> None:
+        """Remove slot from the recency list. O(1)"""
+        prev, next = self.prev, self.next
+        p, n = prev[slot], next[slot]
+        next[p] = n
+        prev[n] = p
+    
+    def _link_at_head(self, slot: int) -> None:
+        """Insert slot right after the sentinel (most recently used). O(1)"""
+        prev, next = self.prev, self.next
+        first = next[0]
+        next[slot] = first
+        prev[slot] = 0
+        prev[first] = slot
+        next[0] = slot
+    
+    def _alloc_slot(self) -> int:
+        """Pop a slot from the free-list, or take the next never-used one. O(1)"""
+        slot = self._free
+        if slot:
+            self._free = self.next[slot]
+            return slot
+        slot = self._high_water
+        self._high_water += 1
+        return slot
+    
+    def _release_slot(self, slot: int) -> None:
+        """Push slot back onto the free-list. O(1)"""
+        self.keys[slot] = self.values[slot] = None
+        self.next[slot] = self._free
+        self._free = slot
+    
+    def get(self, key: int, default: Any = None) -> Optional[int]:
+        """Get value and mark as recently used, or default if absent. O(1)"""
+        slot = self.cache.get(key)
+        if slot is None:
+            return default
+        prev, next = self.prev, self.next
+        first = next[0]
+        if first != slot:
+            # Inlined _unlink + _link_at_head: this is the hot path
+            p, n = prev[slot], next[slot]
+            next[p] = n
+            prev[n] = p
+            next[slot] = first
+            prev[slot] = 0
+            prev[first] = slot
+            next[0] = slot
+        return self.values[slot]
+    
+    def put(self, key: int, value: int) -> None:
+        """Add/update key-value pair. O(1)"""
+        slot = self.cache.get(key)
+        if slot is not None:
+            self.values[slot] = value
+            if self.next[0] != slot:
+                self._unlink(slot)
+                self._link_at_head(slot)
+            return
+        
+        if len(self.cache) >= self.capacity:
+            # Evict LRU and reuse its slot directly
+            slot = self.prev[0]
+            self._unlink(slot)
+            del self.cache[self.keys[slot]]
+            self.evictions += 1
+        else:
+            slot = self._alloc_slot()
+        
+        self.keys[slot] = key
+        self.values[slot] = value
+        self.cache[key] = slot
+        self._link_at_head(slot)
+    
+    def __len__(self) -> int:
+        return len(self.cache)
+
+
+# ============================================================================
+# PART 6: Single-Flight Miss Coalescing
+# ============================================================================
+
+class _Flight:
+    """One in-progress computation that other callers can wait on."""
+    __slots__ = ("done", "result", "error")
+    
+    def __init__(self):
+        self.done = threading.Event()
+        self.result: Any = None
+        self.error: Optional[BaseException] = None
+
+
+class SingleFlight:
+    """
+    Coalesces concurrent calls for the same key into one computation.
+    
+    The first caller for a key (the leader) runs fn(key); callers arriving
+    while it runs wait on an Event and share its result or exception. The
+    flight is removed once it lands, so later misses compute again - the
+    cache, not SingleFlight, is responsible for remembering results.
+    
+    Time: O(1) bookkeeping per call (one short global lock)
+    Space: O(number of keys currently being computed)
+    """
+    
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._flights = {}  # key -> _Flight
+    
+    def do(self, key: int, fn: Callable[[int], Any]) -> Any:
+        with self._lock:
+            flight = self._flights.get(key)
+            leader = flight is None
+            if leader:
+                flight = self._flights[key] = _Flight()
+        
+        if not leader:
+            flight.done.wait()
+            if flight.error is not None:
+                raise flight.error
+            return flight.result
+        
+        try:
+            flight.result = fn(key)
+        except BaseException as e:
+            flight.error = e
+            raise
+        finally:
+            with self._lock:
+                del self._flights[key]
+            flight.done.set()
+        return flight.result
+
+
+# ============================================================================
+# PART 7: Async Memoization for Coroutine Functions
+# ============================================================================
+
+class FIFOCache:
+    """
+    FIFO cache with the same get/put API as LRUCache.
+    
+    Same structure as memo_fifo: hash table + insertion-order queue.
+    get() never reorders; put() evicts the oldest entry when full.
+    
+    Time: O(1) for get/put/evict
+    Space: O(capacity)
+    """
+    
+    def __init__(self, capacity: int):
+        self.capacity = capacity
+        self.cache = {}
+        self.order_queue = deque()
+        self.evictions = 0
+    
+    def get(self, key: int, default: Any = None) -> Optional[int]:
+        """Get value without touching insertion order. O(1)"""
+        return self.cache.get(key, default)
+    
+    def put(self, key: int, value: int) -> None:
+        """Add/update key-value pair, evicting the oldest if full. O(1)"""
+        if key in self.cache:
+            self.cache[key] = value
+            return
+        if len(self.cache) >= self.capacity:
+            oldest = self.order_queue.popleft()
+            del self.cache[oldest]
+            self.evictions += 1
+        self.cache[key] = value
+        self.order_queue.append(key)
+    
+    def __len__(self) -> int:
+        return len(self.cache)
+
+
+def _memo_async(f: Callable[[int], Awaitable[Any]], lookup, store):
+    """
+    Wrap a coroutine function with a cache and in-flight task sharing.
+    
+    - A hit returns the cached result without creating a task
+    - The first miss on a key starts one Task; concurrent awaits of the
+      same key await that Task instead of calling f again
+    - Awaiters are shielded: cancelling one caller never cancels the
+      shared Task, so the other awaiters still get the result
+    - Only successful results are stored. If the Task raises or is itself
+      cancelled, it is dropped from the in-flight table and the next call
+      retries - a failed or cancelled computation never poisons the cache
+    """
+    in_flight = {}  # key -> asyncio.Task
+    
+    def land(x: int, task: asyncio.Task) -> None:
+        if in_flight.get(x) is task:
+            del in_flight[x]
+        if not task.cancelled() and task.exception() is None:
+            store(x, task.result())
+    
+    async def memoized(x: int) -> Any:
+        cached_result = lookup(x)
+        if cached_result is not _MISSING:
             return cached_result
         
-        # Cache miss - compute and store
+        task = in_flight.get(x)
+        if task is None:
+            task = asyncio.ensure_future(f(x))
+            in_flight[x] = task
+            task.add_done_callback(lambda t: land(x, t))
+        return await asyncio.shield(task)
+    
+    return memoized
+
+
+def memo_fifo_async(f: Callable[[int], Awaitable[int]],
+                    max_size: int = 256) -> Callable[[int], Awaitable[int]]:
+    """
+    FIFO memoization for coroutine functions (see memo_fifo).
+    
+    Caches awaited results, not coroutine objects. Concurrent awaits of the
+    same key share one in-flight Task.
+    """
+    lookup, store = _cache_accessors(FIFOCache(max_size), None, None)
+    return _memo_async(f, lookup, store)
+
+
+def memo_lru_async(f: Callable[[int], Awaitable[int]], max_size: int = 256,
+                   compact: bool = False,
+                   max_negative: Optional[int] = None,
+                   policy: str = "lru",
+                   max_weight: Optional[int] = None,
+                   weigher: Optional[Callable[[Any], int]] = None,
+                   ttl: Optional[float] = None) -> Callable[[int], Awaitable[int]]:
+    """
+    LRU memoization for coroutine functions (see memo_lru).
+    
+    Caches awaited results, not coroutine objects. Concurrent awaits of the
+    same key share one in-flight Task (async single-flight), and None
+    results follow the same sentinel/max_negative rules as memo_lru.
+    
+    Intended for use from a single event loop; no locks are needed because
+    all bookkeeping runs between awaits.
+    """
+    cache_cls = _cache_factory(policy, compact, max_weight, weigher, ttl)
+    lookup, store = _cache_accessors(
+        cache_cls(max_size), cache_cls(max_negative) if max_negative else None,
+        max_negative)
+    return _memo_async(f, lookup, store)
+
+
+# ============================================================================
+# PART 8: Pluggable Eviction Policies - LFU, ARC, W-TinyLFU
+# ============================================================================
+
+"""
+Every policy is a cache class with the same interface as LRUCache:
+
+    cache = Policy(capacity)
+    cache.get(key, default=None)   # hit -> value (updates policy state)
+    cache.put(key, value)          # insert/update, evicting if full
+    len(cache)
+
+so memo_lru(policy=...), memo_lru_async(policy=...) and ShardedLRUCache
+(cache_cls=...) can use any of them. All operations are O(1).
+"""
+
+
+class LFUCache:
+    """
+    O(1) LFU cache using frequency buckets.
+    
+    Structure:
+    - cache: {key -> [value, freq]}
+    - buckets: {freq -> OrderedDict of keys} (LRU order within a frequency)
+    - min_freq: lowest non-empty frequency, the eviction bucket
+    
+    A hit moves the key from bucket f to bucket f+1; min_freq only ever
+    advances by one on a hit, or resets to 1 on insert, so no scan is needed.
+    Ties within the lowest frequency are broken by LRU.
+    
+    Good for stable skewed popularity; slow to forget formerly-hot keys.
+    """
+    
+    def __init__(self, capacity: int):
+        self.capacity = capacity
+        self.cache = {}  # key -> [value, freq]
+        self.buckets = {}  # freq -> OrderedDict(key -> None)
+        self.min_freq = 0
+        self.evictions = 0
+    
+    def _bump(self, key: int, entry: list) -> None:
+        """Move key from its frequency bucket to the next one. O(1)"""
+        freq = entry[1]
+        bucket = self.buckets[freq]
+        del bucket[key]
+        if not bucket:
+            del self.buckets[freq]
+            if self.min_freq == freq:
+                self.min_freq = freq + 1
+        entry[1] = freq + 1
+        self.buckets.setdefault(freq + 1, OrderedDict())[key] = None
+    
+    def get(self, key: int, default: Any = None) -> Optional[int]:
+        """Get value and increment its frequency. O(1)"""
+        entry = self.cache.get(key)
+        if entry is None:
+            return default
+        self._bump(key, entry)
+        return entry[0]
+    
+    def put(self, key: int, value: int) -> None:
+        """Add/update key-value pair, evicting the least frequent if full. O(1)"""
+        if self.capacity <= 0:
+            return
+        entry = self.cache.get(key)
+        if entry is not None:
+            entry[0] = value
+            self._bump(key, entry)
+            return
+        
+        if len(self.cache) >= self.capacity:
+            bucket = self.buckets[self.min_freq]
+            victim, _ = bucket.popitem(last=False)
+            if not bucket:
+                del self.buckets[self.min_freq]
+            del self.cache[victim]
+            self.evictions += 1
+        
+        self.cache[key] = [value, 1]
+        self.buckets.setdefault(1, OrderedDict())[key] = None
+        self.min_freq = 1
+    
+    def __len__(self) -> int:
+        return len(self.cache)
+
+
+class ARCCache:
+    """
+    Adaptive Replacement Cache (Megiddo & Modha).
+    
+    Structure:
+    - T1: keys seen once recently (recency list)
+    - T2: keys seen at least twice (frequency list)
+    - B1, B2: ghost lists - keys recently evicted from T1/T2 (no values)
+    - p: adaptive target size for T1
+    
+    A hit in ghost list B1 means T1 was too small, so p grows; a hit in B2
+    means T2 was too small, so p shrinks. A one-pass scan only churns T1
+    and never flushes the frequently used keys in T2.
+    
+    Time: O(1) per operation (OrderedDicts as LRU lists)
+    Space: O(capacity) values + O(capacity) ghost keys
+    """
+    
+    def __init__(self, capacity: int):
+        self.capacity = capacity
+        self.p = 0.0
+        self.t1 = OrderedDict()  # key -> value
+        self.t2 = OrderedDict()  # key -> value
+        self.b1 = OrderedDict()  # key -> None (ghost)
+        self.b2 = OrderedDict()  # key -> None (ghost)
+        self.evictions = 0  # values dropped from T1/T2 (ghost trimming not counted)
+    
+    def _replace(self, key: int) -> None:
+        """Evict from T1 or T2 into its ghost list, steered by p. O(1)"""
+        if len(self.t1) + len(self.t2) < self.capacity:
+            return
+        self.evictions += 1
+        if self.t1 and (len(self.t1) > self.p or (key in self.b2 and len(self.t1) == self.p)):
+            old, _ = self.t1.popitem(last=False)
+            self.b1[old] = None
+        else:
+            old, _ = self.t2.popitem(last=False)
+            self.b2[old] = None
+    
+    def get(self, key: int, default: Any = None) -> Optional[int]:
+        """Get value; a hit promotes the key to the MRU end of T2. O(1)"""
+        if key in self.t1:
+            value = self.t2[key] = self.t1.pop(key)
+            return value
+        if key in self.t2:
+            self.t2.move_to_end(key)
+            return self.t2[key]
+        return default
+    
+    def put(self, key: int, value: int) -> None:
+        """Add/update key-value pair, adapting p on ghost hits. O(1)"""
+        c = self.capacity
+        if c <= 0:
+            return
+        if key in self.t1:
+            del self.t1[key]
+            self.t2[key] = value
+            return
+        if key in self.t2:
+            self.t2[key] = value
+            self.t2.move_to_end(key)
+            return
+        
+        if key in self.b1:
+            self.p = min(c, self.p + max(len(self.b2) / len(self.b1), 1))
+            self._replace(key)
+            del self.b1[key]
+            self.t2[key] = value
+            return
+        if key in self.b2:
+            self.p = max(0.0, self.p - max(len(self.b1) / len(self.b2), 1))
+            self._replace(key)
+            del self.b2[key]
+            self.t2[key] = value
+            return
+        
+        # Brand-new key
+        l1 = len(self.t1) + len(self.b1)
+        total = l1 + len(self.t2) + len(self.b2)
+        if l1 >= c:
+            if len(self.t1) < c:
+                self.b1.popitem(last=False)
+                self._replace(key)
+            else:
+                self.t1.popitem(last=False)
+                self.evictions += 1
+        elif total >= c:
+            if total >= 2 * c:
+                self.b2.popitem(last=False)
+            self._replace(key)
+        self.t1[key] = value
+    
+    def __len__(self) -> int:
+        return len(self.t1) + len(self.t2)
+
+
+class CountMinSketch:
+    """
+    Approximate frequency counter with periodic aging (for TinyLFU).
+    
+    depth rows of `width` saturating 4-bit counters (stored in bytes);
+    estimate() is the minimum over the rows, which only over-estimates.
+    After sample_size increments every counter is halved, so the sketch
+    tracks recent popularity and old hot keys fade out.
+    
+    Time: O(depth) = O(1) per increment/estimate; aging is O(width) once
+    per sample_size increments, i.e. O(1) amortized.
+    """
+    
+    _MAX_COUNT = 15
+    _SEEDS = (0x9E3779B97F4A7C15, 0xC2B2AE3D27D4EB4F, 0x165667B19E3779F9, 0xD6E8FEB86659FD93)
+    
+    def __init__(self, width: int, sample_size: int, depth: int = 4):
+        self.bits = max(4, (width - 1).bit_length())
+        self.width = 1 << self.bits
+        self.mask = self.width - 1
+        self.depth = min(depth, len(self._SEEDS))
+        self.rows = [bytearray(self.width) for _ in range(self.depth)]
+        self.sample_size = sample_size
+        self.additions = 0
+    
+    def _indexes(self, key: int):
+        h = hash(key) & 0xFFFFFFFFFFFFFFFF
+        return [((h * seed) & 0xFFFFFFFFFFFFFFFF) >> (64 - self.bits) for seed in self._SEEDS[:self.depth]]
+    
+    def increment(self, key: int) -> None:
+        for row, i in zip(self.rows, self._indexes(key)):
+            if row[i] < self._MAX_COUNT:
+                row[i] += 1
+        self.additions += 1
+        if self.additions >= self.sample_size:
+            self._age()
+    
+    def estimate(self, key: int) -> int:
+        return min(row[i] for row, i in zip(self.rows, self._indexes(key)))
+    
+    def _age(self) -> None:
+        """Halve every counter. O(width), amortized over sample_size increments"""
+        table = bytes(c >> 1 for c in range(256))
+        self.rows = [row.translate(table) for row in self.rows]
+        self.additions //= 2
+
+
+class TinyLFUCache:
+    """
+    W-TinyLFU cache (Einziger, Friedman & Manes; the Caffeine design).
+    
+    Structure:
+    - window: small LRU (~1% of capacity) that absorbs bursts of new keys
+    - main: segmented LRU - probation (~20%) and protected (~80%)
+    - sketch: CountMinSketch of recent access frequency
+    
+    New keys enter the window. When the window overflows, its LRU key
+    (the candidate) competes with the main cache's LRU victim: the
+    candidate is admitted only if the sketch says it is accessed more often.
+    A scan of one-hit keys therefore passes through the window and never
+    displaces the popular keys in main.
+    
+    Frequency is recorded on every get(), i.e. on every memo lookup.
+    
+    Time: O(1) per operation
+    Space: O(capacity) entries + O(capacity) sketch bytes
+    """
+    
+    def __init__(self, capacity: int):
+        self.capacity = capacity
+        self.window_cap = max(1, capacity // 100)
+        self.main_cap = max(0, capacity - self.window_cap)
+        self.protected_cap = int(self.main_cap * 0.8)
+        self.window = OrderedDict()     # key -> value
+        self.probation = OrderedDict()  # key -> value
+        self.protected = OrderedDict()  # key -> value
+        self.sketch = CountMinSketch(width=max(16, capacity), sample_size=10 * max(1, capacity))
+        self.evictions = 0  # rejected candidates + displaced victims
+    
+    def _promote(self, key: int, value: Any) -> None:
+        """Move a probation hit into protected, demoting protected's LRU. O(1)"""
+        self.protected[key] = value
+        if len(self.protected) > self.protected_cap:
+            old, old_value = self.protected.popitem(last=False)
+            self.probation[old] = old_value
+    
+    def get(self, key: int, default: Any = None) -> Optional[int]:
+        """Record the access and return the value if cached. O(1)"""
+        self.sketch.increment(key)
+        if key in self.window:
+            self.window.move_to_end(key)
+            return self.window[key]
+        if key in self.protected:
+            self.protected.move_to_end(key)
+            return self.protected[key]
+        if key in self.probation:
+            value = self.probation.pop(key)
+            self._promote(key, value)
+            return value
+        return default
+    
+    def put(self, key: int, value: int) -> None:
+        """Add/update key-value pair; overflow goes through TinyLFU admission. O(1)"""
+        if self.capacity <= 0:
+            return
+        for segment in (self.window, self.protected):
+            if key in segment:
+                segment[key] = value
+                segment.move_to_end(key)
+                return
+        if key in self.probation:
+            del self.probation[key]
+            self._promote(key, value)
+            return
+        
+        self.window[key] = value
+        if len(self.window) <= self.window_cap:
+            return
+        
+        candidate, candidate_value = self.window.popitem(last=False)
+        if len(self.probation) + len(self.protected) < self.main_cap:
+            self.probation[candidate] = candidate_value
+            return
+        self.evictions += 1  # either the candidate or the victim goes
+        if not self.main_cap:
+            return
+        victim_segment = self.probation if self.probation else self.protected
+        victim = next(iter(victim_segment))
+        if self.sketch.estimate(candidate) > self.sketch.estimate(victim):
+            del victim_segment[victim]
+            self.probation[candidate] = candidate_value
+    
+    def __len__(self) -> int:
+        return len(self.window) + len(self.probation) + len(self.protected)
+
+
+POLICIES = {
+    "lru": LRUCache,
+    "fifo": FIFOCache,
+    "lfu": LFUCache,
+    "arc": ARCCache,
+    "tinylfu": TinyLFUCache,
+}
+
+
+def _policy_cache_cls(policy: str, compact: bool = False) -> type:
+    """Resolve a policy name (and the compact flag) to a cache class."""
+    if policy not in POLICIES:
+        raise ValueError(f"unknown policy {policy!r}; expected one of {sorted(POLICIES)}")
+    if compact:
+        if policy != "lru":
+            raise ValueError("compact=True is only available for policy='lru'")
+        return CompactLRUCache
+    return POLICIES[policy]
+
+
+# ============================================================================
+# PART 9: Weight- and TTL-Bounded Caches
+# ============================================================================
+
+class BoundedNode(Node):
+    """LRU node that also carries its weight and absolute expiry time."""
+    def __init__(self, key: int, value: int, weight: int, expires_at: Optional[float]):
+        super().__init__(key, value)
+        self.weight = weight
+        self.expires_at = expires_at
+
+
+class BoundedCache(LRUCache):
+    """
+    LRU (or FIFO) cache bounded by entry count, total weight and TTL.
+    
+    Bounds (each optional):
+    - capacity: max number of entries
+    - max_weight: max sum of weigher(value); default weigher is
+      sys.getsizeof, a shallow approximation of an object's size
+    - ttl: seconds an entry stays fresh; put(key, value, ttl=...) overrides
+      it per entry
+    
+    Eviction pops from the tail until the cache is back under BOTH the
+    count and the weight budget. A value heavier than max_weight on its own
+    is not cached at all. `evictions` counts only these budget evictions,
+    not expiries.
+    
+    Expiry:
+    - Lazy: get() treats an expired entry as a miss and removes it
+    - Background: every get/put also inspects the oldest EXPIRE_BATCH
+      entries of an expiry queue, dropping expired ones and rotating the
+      rest. Stale entries disappear without a sweep, at O(1) per operation.
+    
+    fifo=True keeps insertion order (get() doesn't reorder).
+    """
+    
+    EXPIRE_BATCH = 2
+    
+    def __init__(self, capacity: Optional[int] = None, max_weight: Optional[int] = None,
+                 weigher: Optional[Callable[[Any], int]] = None, ttl: Optional[float] = None,
+                 fifo: bool = False, clock: Callable[[], float] = time.monotonic):
+        super().__init__(capacity)
+        self.max_weight = max_weight
+        self.weigher = weigher or sys.getsizeof
+        self.ttl = ttl
+        self.fifo = fifo
+        self.clock = clock
+        self.weight = 0
+        self._expiry_queue = deque()  # nodes with an expiry, oldest first
+    
+    def _unlink(self, node: BoundedNode) -> None:
+        """Remove node from the list and the table, releasing its weight. O(1)"""
+        self._remove(node)
+        del self.cache[node.key]
+        self.weight -= node.weight
+    
+    def _expire_some(self, now: float) -> None:
+        """Amortized background expiry: look at a constant number of entries. O(1)"""
+        queue = self._expiry_queue
+        for _ in range(min(self.EXPIRE_BATCH, len(queue))):
+            node = queue.popleft()
+            if self.cache.get(node.key) is not node:
+                continue  # already evicted or replaced
+            if node.expires_at <= now:
+                self._unlink(node)
+            else:
+                queue.append(node)
+    
+    def get(self, key: int, default: Any = None) -> Optional[int]:
+        """Get a fresh value (expired entries are misses). O(1)"""
+        now = self.clock()
+        if self._expiry_queue:
+            self._expire_some(now)
+        node = self.cache.get(key)
+        if node is None:
+            return default
+        if node.expires_at is not None and node.expires_at <= now:
+            self._unlink(node)
+            return default
+        if not self.fifo:
+            self._move_to_head(node)
+        return node.value
+    
+    def get_many(self, keys: Iterable[int], default: Any = None) -> List[Any]:
+        """Per-key get(): every lookup must check expiry."""
+        return [self.get(key, default) for key in keys]
+    
+    def put_many(self, items: Iterable[Tuple[int, Any]]) -> None:
+        """Per-key put(): every insert must be weighed and stamped."""
+        for key, value in items:
+            self.put(key, value)
+    
+    def put(self, key: int, value: int, ttl: Optional[float] = None) -> None:
+        """Add/update key-value pair, then evict until within budget. O(1) amortized"""
+        now = self.clock()
+        if self._expiry_queue:
+            self._expire_some(now)
+        weight = self.weigher(value) if self.max_weight is not None else 0
+        old = self.cache.get(key)
+        if old is not None:
+            self._unlink(old)
+        if self.max_weight is not None and weight > self.max_weight:
+            return
+        
+        ttl = self.ttl if ttl is None else ttl
+        node = BoundedNode(key, value, weight, None if ttl is None else now + ttl)
+        self.cache[key] = node
+        self.weight += weight
+        if self.fifo and old is not None:
+            # An update keeps its place in the FIFO order
+            node.prev, node.next = old.prev, old.next
+            node.prev.next = node
+            node.next.prev = node
+        else:
+            self._add_to_head(node)
+        if node.expires_at is not None:
+            self._expiry_queue.append(node)
+        
+        while self.cache and (
+                (self.capacity is not None and len(self.cache) > self.capacity)
+                or (self.max_weight is not None and self.weight > self.max_weight)):
+            self._unlink(self.tail.prev)
+            self.evictions += 1
+
+
+def _cache_factory(policy: str, compact: bool, max_weight: Optional[int],
+                   weigher: Optional[Callable[[Any], int]], ttl: Optional[float],
+                   shards: int = 1) -> Callable[[int], Any]:
+    """
+    Cache constructor for memo_* options: a policy class, or a BoundedCache
+    when max_weight/ttl are set. Across shards, max_weight is split evenly.
+    """
+    if max_weight is None and ttl is None:
+        return _policy_cache_cls(policy, compact)
+    if compact or policy not in ("lru", "fifo"):
+        raise ValueError("max_weight/ttl are supported for policy 'lru' or 'fifo' without compact")
+    if max_weight is not None:
+        max_weight = max(1, max_weight // shards)
+    return functools.partial(BoundedCache, max_weight=max_weight, weigher=weigher,
+                             ttl=ttl, fifo=policy == "fifo")
+
+
+# ============================================================================
+# PART 10: Persistent, Memory-Mapped Second-Tier (L2) Cache
+# ============================================================================
+
+class DiskTier:
+    """
+    Append-only, memory-mapped key/value store used as an L2 cache tier.
+    
+    File format - a sequence of records, last record for a key wins:
+        <key_len:u32><value_len:u32><codec:u8><key bytes><value bytes>
+    Keys and values are serialized with marshal (compact, fast for ints,
+    strings, tuples...) and fall back to pickle for anything else.
+    
+    - Index: {key -> (value offset, value length, codec)}, rebuilt by one
+      scan on open; a torn record at the end is truncated away
+    - Reads: slice the mmap (remapped only after the file grows)
+    - Writes: buffered in memory and appended in batches of flush_every
+      records with a single write(). The hot path never calls fsync;
+      sync() does, and runs from close() or an optional background thread
+      every sync_interval seconds.
+    - compact() streams the live records into `<path>.tmp` and renames it
+      over the file, so a crash mid-rewrite leaves the old file intact.
+      sync() runs it once dead space exceeds live space - from close() or
+      the background thread, never from put()
+    
+    A hot-key list (most recent first) is kept in a sidecar file
+    `<path>.hot` so a restarted process can preload the keys that were in
+    memory when the previous one shut down.
+    """
+    
+    _HEADER = struct.Struct("<IIB")
+    _MARSHAL, _PICKLE = 0, 1
+    
+    def __init__(self, path: str, flush_every: int = 256,
+                 sync_interval: Optional[float] = None):
+        self.path = path
+        self.flush_every = flush_every
+        self._lock = threading.Lock()
+        self._file = open(path, "a+b")
+        self._index = {}    # key -> (offset, length, codec)
+        self._pending = {}  # key -> (codec, value bytes), not yet written
+        self._dead_bytes = 0
+        self._map: Optional[mmap.mmap] = None
+        self._mapped_size = 0
+        self._load_index()
+        self._closed = False
+        if sync_interval is not None:
+            threading.Thread(target=self._sync_loop, args=(sync_interval,), daemon=True).start()
+    
+    @classmethod
+    def _encode(cls, obj: Any):
+        try:
+            return cls._MARSHAL, marshal.dumps(obj)
+        except ValueError:
+            return cls._PICKLE, pickle.dumps(obj, pickle.HIGHEST_PROTOCOL)
+    
+    @classmethod
+    def _decode(cls, codec: int, data: bytes) -> Any:
+        return marshal.loads(data) if codec == cls._MARSHAL else pickle.loads(data)
+    
+    def _remap(self) -> None:
+        size = os.fstat(self._file.fileno()).st_size
+        if size == self._mapped_size:
+            return
+        if self._map is not None:
+            self._map.close()
+        self._map = mmap.mmap(self._file.fileno(), size, access=mmap.ACCESS_READ) if size else None
+        self._mapped_size = size
+    
+    def _load_index(self) -> None:
+        """Scan every record once to rebuild the index. O(file size)"""
+        self._remap()
+        data, pos, header = self._map, 0, self._HEADER
+        while data is not None and pos + header.size <= self._mapped_size:
+            key_len, value_len, codec = header.unpack_from(data, pos)
+            end = pos + header.size + key_len + value_len
+            if end > self._mapped_size:
+                break  # torn write at the tail
+            key_start = pos + header.size
+            key = marshal.loads(data[key_start:key_start + key_len])
+            if key in self._index:
+                self._dead_bytes += header.size + key_len + self._index[key][1]
+            self._index[key] = (key_start + key_len, value_len, codec)
+            pos = end
+        if pos < self._mapped_size:
+            self._file.truncate(pos)
+            self._remap()
+    
+    def get(self, key: int, default: Any = None) -> Any:
+        """Read a value from the pending batch or the mmap. O(1) + decode"""
+        pending = self._pending.get(key)
+        if pending is not None:
+            return self._decode(*pending)
+        with self._lock:  # a background compact() may swap the file and index
+            entry = self._index.get(key)
+            if entry is None:
+                return default
+            offset, length, codec = entry
+            if offset + length > self._mapped_size:
+                self._remap()
+            data = self._map[offset:offset + length]
+        return self._decode(codec, data)
+    
+    def put(self, key: int, value: Any) -> None:
+        """Queue a write; every flush_every writes go out in one batch. O(1) amortized"""
+        record = self._encode(value)
+        with self._lock:
+            self._pending[key] = record
+        if len(self._pending) >= self.flush_every:
+            self.flush()
+    
+    def __contains__(self, key: int) -> bool:
+        return key in self._pending or key in self._index
+    
+    def __len__(self) -> int:
+        return len(self._index.keys() | self._pending.keys())
+    
+    def flush(self) -> None:
+        """Append all pending records with one write(). No fsync."""
+        with self._lock:
+            if not self._pending:
+                return
+            self._file.seek(0, os.SEEK_END)
+            offset = self._file.tell()
+            chunks = []
+            for key, (codec, data) in self._pending.items():
+                key_bytes = marshal.dumps(key)
+                chunks.append(self._HEADER.pack(len(key_bytes), len(data), codec))
+                chunks.append(key_bytes)
+                chunks.append(data)
+                offset += self._HEADER.size + len(key_bytes)
+                if key in self._index:
+                    self._dead_bytes += self._HEADER.size + len(key_bytes) + self._index[key][1]
+                self._index[key] = (offset, len(data), codec)
+                offset += len(data)
+            self._file.write(b"".join(chunks))
+            self._file.flush()
+            self._pending.clear()
+    
+    def sync(self) -> None:
+        """
+        Flush and fsync - durable, so kept off the hot path. Then compact
+        once dead records take more space than live ones, so the file
+        stays under about twice the live data.
+        """
+        self.flush()
+        with self._lock:
+            os.fsync(self._file.fileno())
+            size = os.fstat(self._file.fileno()).st_size
+        if self._dead_bytes > size - self._dead_bytes:
+            self.compact()
+    
+    def _sync_loop(self, interval: float) -> None:
+        while not self._closed:
+            time.sleep(interval)
+            try:
+                self.sync()
+            except ValueError:
+                return  # file closed underneath us
+    
+    def hot_keys(self) -> List[int]:
+        """Keys recorded as hot by the last write_hot_keys(), most recent first."""
+        try:
+            with open(self.path + ".hot", "rb") as f:
+                return [k for k in marshal.load(f) if k in self]
+        except (OSError, EOFError, ValueError):
+            return []
+    
+    def write_hot_keys(self, keys: List[int]) -> None:
+        with open(self.path + ".hot", "wb") as f:
+            marshal.dump(list(keys), f)
+    
+    def compact(self) -> None:
+        """
+        Copy the live records, one at a time, into `<path>.tmp`, fsync it
+        and rename it over the file. The old file stays complete until the
+        rename. O(live bytes) time, O(largest record) extra memory
+        """
+        self.flush()
+        tmp_path = self.path + ".tmp"
+        header, index, offset = self._HEADER, {}, 0
+        with self._lock:
+            self._remap()
+            with open(tmp_path, "wb", buffering=1 << 20) as out:
+                for key, (value_offset, length, codec) in self._index.items():
+                    key_bytes = marshal.dumps(key)
+                    out.write(header.pack(len(key_bytes), length, codec))
+                    out.write(key_bytes)
+                    out.write(self._map[value_offset:value_offset + length])
+                    offset += header.size + len(key_bytes)
+                    index[key] = (offset, length, codec)
+                    offset += length
+                out.flush()
+                os.fsync(out.fileno())
+            if self._map is not None:
+                self._map.close()
+                self._map, self._mapped_size = None, 0
+            self._file.close()
+            os.replace(tmp_path, self.path)
+            self._file = open(self.path, "a+b")
+            self._index = index
+            self._dead_bytes = 0
+            self._remap()
+    
+    def close(self) -> None:
+        if self._closed:
+            return
+        self.sync()
+        with self._lock:
+            self._closed = True
+            if self._map is not None:
+                self._map.close()
+            self._file.close()
+
+
+class TieredCache:
+    """
+    In-memory LRUCache (L1) in front of a DiskTier (L2).
+    
+    - put(): goes to L1; entries evicted from L1 spill to L2, unless L2
+      already holds the same value (promoted or preloaded and never
+      overwritten), so the L2 file grows with distinct keys, not with
+      evictions
+    - get(): L1 hit, else L2 hit (promoted back into L1), else default
+    - startup: the first `preload` hot keys recorded by the previous
+      process are loaded from L2 into L1 before serving
+    - close(): spills every L1 entry to L2, records L1's keys (MRU first)
+      as the hot list and syncs the file
+    
+    Time: L1 hit O(1); L2 hit O(1) + deserialization
+    """
+    
+    def __init__(self, capacity: int, l2: DiskTier, preload: int = 1024):
+        self.l2 = l2
+        self.l1 = LRUCache(capacity, on_evict=self._spill)
+        self._dirty = set()  # L1 keys whose value is not in L2 yet
+        for key in reversed(l2.hot_keys()[:min(preload, capacity)]):
+            self.l1.put(key, l2.get(key))
+    
+    def _spill(self, key: int, value: Any) -> None:
+        if key in self._dirty or key not in self.l2:
+            self._dirty.discard(key)
+            self.l2.put(key, value)
+    
+    def get(self, key: int, default: Any = None) -> Any:
+        value = self.l1.get(key, _MISSING)
+        if value is not _MISSING:
+            return value
+        value = self.l2.get(key, _MISSING)
+        if value is _MISSING:
+            return default
+        self.l1.put(key, value)
+        return value
+    
+    def put(self, key: int, value: Any) -> None:
+        self._dirty.add(key)
+        self.l1.put(key, value)
+    
+    @property
+    def evictions(self) -> int:
+        """L1 evictions, including those caused by promoting L2 hits."""
+        return self.l1.evictions
+    
+    def __len__(self) -> int:
+        return len(self.l1)
+    
+    def close(self) -> None:
+        if self.l2._closed:
+            return
+        hot, node = [], self.l1.head.next
+        while node is not self.l1.tail:
+            self._spill(node.key, node.value)
+            hot.append(node.key)
+            node = node.next
+        self.l2.write_hot_keys(hot)
+        self.l2.close()
+
+
+# ============================================================================
+# PART 11: Cross-Process Shared-Memory Cache
+# ============================================================================
+
+class SharedMemoryCache:
+    """
+    Bounded int -> int cache living in one multiprocessing.shared_memory block.
+    
+    Every worker of a process pool attaches to the same block, so they share
+    one cache (one hit rate, one copy in memory) with no pickling - keys and
+    values are raw int64s.
+    
+    Layout (all int64):
+    - header: [clock hand, number of used slots]
+    - keys[capacity], values[capacity], ref[capacity]: entry slots
+    - index[table_size]: open-addressing hash table (linear probing) of
+      slot + 1, 0 = empty; table_size is a power of two >= 2 * capacity so
+      the load factor stays <= 0.5
+    
+    Eviction is CLOCK (approximate LRU): a hit sets ref[slot] = 1; when the
+    cache is full the hand sweeps, clearing ref bits, and evicts the first
+    slot whose bit is already 0. Evicted keys leave the hash table by
+    backward-shift deletion, so there are no tombstones.
+    
+    One multiprocessing.Lock guards all operations. f itself runs outside
+    the lock, so two processes may occasionally compute the same key.
+    
+    Time: O(1) expected per get/put; CLOCK eviction is O(1) amortized
+    Space: 8 * (3 * capacity + table_size + 2) bytes, shared by all workers
+    """
+    
+    _HEADER = 2
+    
+    def __init__(self, capacity: int, name: Optional[str] = None, lock=None):
+        if capacity < 1:
+            raise ValueError("capacity must be >= 1")
+        self.capacity = capacity
+        self.table_size = 1 << max(1, (2 * capacity - 1).bit_length())
+        self.mask = self.table_size - 1
+        self.bits = self.table_size.bit_length() - 1
+        self.lock = lock if lock is not None else multiprocessing.Lock()
+        nbytes = 8 * (self._HEADER + 3 * capacity + self.table_size)
+        self._owner = name is None
+        if self._owner:
+            self.shm = shared_memory.SharedMemory(create=True, size=nbytes)
+        else:
+            self.shm = self._attach(name)
+        self._bind()
+    
+    @staticmethod
+    def _attach(name: str) -> shared_memory.SharedMemory:
+        """Attach without letting this process's resource tracker own (and unlink) it."""
+        try:
+            return shared_memory.SharedMemory(name=name, track=False)
+        except TypeError:  # Python < 3.13
+            shm = shared_memory.SharedMemory(name=name)
+            resource_tracker.unregister(shm._name, "shared_memory")
+            return shm
+    
+    def _bind(self) -> None:
+        words = self.shm.buf.cast("q")
+        cap, h = self.capacity, self._HEADER
+        self._words = words
+        self.header = words[:h]
+        self.keys = words[h:h + cap]
+        self.values = words[h + cap:h + 2 * cap]
+        self.ref = words[h + 2 * cap:h + 3 * cap]
+        self.index = words[h + 3 * cap:h + 3 * cap + self.table_size]
+    
+    def __getstate__(self):
+        # Sent to workers (e.g. ProcessPoolExecutor initargs): re-attach by name
+        return self.shm.name, self.capacity, self.lock
+    
+    def __setstate__(self, state):
+        name, capacity, lock = state
+        self.__init__(capacity, name=name, lock=lock)
+    
+    def _home(self, key: int) -> int:
+        return ((key * 0x9E3779B97F4A7C15) & 0xFFFFFFFFFFFFFFFF) >> (64 - self.bits)
+    
+    def _find(self, key: int):
+        """Return (index position, slot) for key, or (first empty position, -1)."""
+        index, keys, mask = self.index, self.keys, self.mask
+        i = self._home(key)
+        while True:
+            entry = index[i]
+            if entry == 0:
+                return i, -1
+            if keys[entry - 1] == key:
+                return i, entry - 1
+            i = (i + 1) & mask
+    
+    def _delete_at(self, i: int) -> None:
+        """Backward-shift deletion: pull later probe-chain entries into the hole."""
+        index, keys, mask = self.index, self.keys, self.mask
+        j = i
+        while True:
+            j = (j + 1) & mask
+            entry = index[j]
+            if entry == 0:
+                break
+            home = self._home(keys[entry - 1])
+            # Move j into hole i if i lies cyclically between home and j
+            if ((j - home) & mask) >= ((j - i) & mask):
+                index[i] = entry
+                i = j
+        index[i] = 0
+    
+    def get(self, key: int, default: Any = None) -> Optional[int]:
+        """Look up key and set its CLOCK reference bit. O(1) expected"""
+        with self.lock:
+            _, slot = self._find(key)
+            if slot < 0:
+                return default
+            self.ref[slot] = 1
+            return self.values[slot]
+    
+    def put(self, key: int, value: int) -> None:
+        """Insert/update key, evicting with CLOCK when full. O(1) amortized"""
+        with self.lock:
+            i, slot = self._find(key)
+            if slot >= 0:
+                self.values[slot] = value
+                self.ref[slot] = 1
+                return
+            
+            header, ref = self.header, self.ref
+            if header[1] < self.capacity:
+                slot = header[1]
+                header[1] = slot + 1
+            else:
+                hand = header[0]
+                while ref[hand]:
+                    ref[hand] = 0
+                    hand = (hand + 1) % self.capacity
+                slot = hand
+                header[0] = (hand + 1) % self.capacity
+                self._delete_at(self._find(self.keys[slot])[0])
+                i, _ = self._find(key)  # the hole may have moved
+            
+            self.keys[slot] = key
+            self.values[slot] = value
+            ref[slot] = 0
+            self.index[i] = slot + 1
+    
+    def __len__(self) -> int:
+        return self.header[1]
+    
+    def close(self) -> None:
+        """Detach this process; the creating process also frees the block."""
+        for view in (self.header, self.keys, self.values, self.ref, self.index, self._words):
+            view.release()
+        self.shm.close()
+        if self._owner:
+            self.shm.unlink()
+
+
+def memo_shared(f: Callable[[int], int], cache: SharedMemoryCache) -> Callable[[int], int]:
+    """
+    Memoize an int -> int function in a SharedMemoryCache.
+    
+    Create the cache once in the parent and hand it to every worker (e.g.
+    via ProcessPoolExecutor initargs); each worker wraps f with the same
+    cache and all of them share its hits.
+    """
+    def memoized(x: int) -> int:
+        cached_result = cache.get(x, _MISSING)
+        if cached_result is not _MISSING:
+            return cached_result
         result = f(x)
-        lru_cache.put(x, result)
+        cache.put(x, result)
         return result
     
     return memoized
 
 
+# ============================================================================
+# PART 12: Opt-In Instrumentation
+# ============================================================================
+
+CacheInfo = namedtuple("CacheInfo", ["hits", "misses", "evictions", "maxsize", "currsize", "weight"])
+
+
+class CacheStats:
+    """
+    Counters and latency histograms for one memo_* wrapper.
+    
+    Only installed when stats=True, by wrapping two points:
+    - the memoized function: counts calls; every SAMPLE_EVERY-th call is
+      timed end to end, to estimate total time spent in the wrapper
+    - f: counts misses, records f's latency in a log2 histogram (bucket i
+      holds durations < 2**i ns). memoized.map(..., batch_f=...) times the
+      batch_f call and records each of its keys at the mean latency
+    
+    evictions and weight are read from the caches themselves: every cache
+    class counts the entries it drops to make room (TTL expiries and
+    updates are not evictions).
+    
+    hits = calls - misses, so callers that wait on a single-flight leader
+    count as hits. Counters are plain ints: exact single-threaded,
+    approximate (never blocking) under threads.
+    
+    bookkeeping time ~= estimated total wrapper time - time spent in f
+    """
+    
+    SAMPLE_EVERY = 64
+    
+    def __init__(self, maxsize: Optional[int], caches: List[Any]):
+        self.maxsize = maxsize
+        self.caches = caches
+        self.calls = 0
+        self.misses = 0
+        self.f_ns = 0
+        self.miss_histogram = [0] * 64
+        self.sampled_calls = 0
+        self.sampled_ns = 0
+        self._stop_export = threading.Event()
+    
+    def timed(self, f: Callable[[int], Any]) -> Callable[[int], Any]:
+        perf_counter_ns, histogram = time.perf_counter_ns, self.miss_histogram
+        
+        def timed_f(x: int) -> Any:
+            start = perf_counter_ns()
+            try:
+                return f(x)
+            finally:
+                elapsed = perf_counter_ns() - start
+                self.misses += 1
+                self.f_ns += elapsed
+                histogram[min(elapsed.bit_length(), 63)] += 1
+        
+        return timed_f
+    
+    def record_batch(self, count: int, elapsed_ns: int) -> None:
+        """A batch_f call for `count` misses: each is recorded at the mean latency."""
+        self.misses += count
+        self.f_ns += elapsed_ns
+        self.miss_histogram[min((elapsed_ns // count).bit_length(), 63)] += count
+    
+    def wrap(self, memoized: Callable[[int], Any],
+             export: Optional[Callable[[dict], None]] = None,
+             interval: float = 60.0) -> Callable[[int], Any]:
+        """Count calls around memoized and attach cache_info/snapshot."""
+        perf_counter_ns, mask = time.perf_counter_ns, self.SAMPLE_EVERY - 1
+        
+        def instrumented(x: int) -> Any:
+            self.calls += 1
+            if self.calls & mask:
+                return memoized(x)
+            start = perf_counter_ns()
+            try:
+                return memoized(x)
+            finally:
+                self.sampled_ns += perf_counter_ns() - start
+                self.sampled_calls += 1
+        
+        instrumented.cache_info = self.cache_info
+        instrumented.snapshot = self.snapshot
+        instrumented.stop_export = self._stop_export.set
+        if export is not None:
+            threading.Thread(target=self._export_loop, args=(export, interval), daemon=True).start()
+        return instrumented
+    
+    def _export_loop(self, export: Callable[[dict], None], interval: float) -> None:
+        while not self._stop_export.wait(interval):
+            export(self.snapshot())
+    
+    def cache_info(self) -> CacheInfo:
+        currsize = sum(len(c) for c in self.caches)
+        evictions = sum(c.evictions for c in self.caches)
+        weight = sum(getattr(c, "weight", 0) for c in self.caches)
+        return CacheInfo(self.calls - self.misses, self.misses,
+                         evictions, self.maxsize, currsize, weight)
+    
+    def snapshot(self) -> dict:
+        """cache_info() plus timing, as a plain dict (JSON-friendly)."""
+        info = self.cache_info()
+        total_ns = (self.sampled_ns / self.sampled_calls * self.calls
+                    if self.sampled_calls else 0.0)
+        return {
+            **info._asdict(),
+            "hit_ratio": info.hits / self.calls if self.calls else 0.0,
+            "f_seconds": self.f_ns / 1e9,
+            "mean_miss_ns": self.f_ns / self.misses if self.misses else 0.0,
+            "est_total_seconds": total_ns / 1e9,
+            "est_bookkeeping_seconds": max(0.0, total_ns - self.f_ns) / 1e9,
+            # {upper bound in ns: count} for non-empty log2 buckets
+            "miss_latency_histogram": {1 << i: n for i, n in enumerate(self.miss_histogram) if n},
+        }
+
+
+# ============================================================================
+# PART 13: Batch API - get_many / put_many / memoized.map
+# ============================================================================
+
+def _batch_map(f: Callable[[int], Any], cache, lookup, store, plain: bool,
+               stats_obj: Optional[CacheStats]):
+    """
+    Build memoized.map(xs, batch_f=None) -> list of results, in input order.
+    
+    1. Resolve every key in one pass - cache.get_many() when the cache has
+       one (LRUCache), per-key lookups otherwise
+    2. Deduplicate the misses, preserving first-seen order
+    3. Compute them together: batch_f(list_of_misses) -> list of results
+       (e.g. one vectorized or bulk I/O call) if given, else f per key
+    4. Insert them with cache.put_many() - one relink and one eviction
+       sweep for the whole batch
+    
+    Misses that don't fit in the cache are still returned correctly.
+    """
+    use_bulk = plain and hasattr(cache, "get_many")
+    
+    def batch_map(xs: Iterable[int],
+                  batch_f: Optional[Callable[[List[int]], List[Any]]] = None) -> List[Any]:
+        xs = list(xs)
+        if use_bulk:
+            results = cache.get_many(xs, _MISSING)
+        else:
+            results = [lookup(x) for x in xs]
+        
+        misses = list(dict.fromkeys(x for x, r in zip(xs, results) if r is _MISSING))
+        if misses:
+            if batch_f is not None:
+                start = time.perf_counter_ns()
+                values = list(batch_f(misses))
+                if stats_obj is not None:
+                    stats_obj.record_batch(len(misses), time.perf_counter_ns() - start)
+                if len(values) != len(misses):
+                    raise ValueError("batch_f must return one result per key")
+            else:
+                values = [f(x) for x in misses]
+            computed = dict(zip(misses, values))
+            if use_bulk:
+                cache.put_many(computed.items())
+            else:
+                for x, value in computed.items():
+                    store(x, value)
+            results = [computed[x] if r is _MISSING else r for x, r in zip(xs, results)]
+        
+        if stats_obj is not None:
+            stats_obj.calls += len(xs)
+        return results
+    
+    return batch_map
+
+
 # ============================================================================
 # Testing and Examples
 # ============================================================================
@@ -255,6 +1982,538 @@ def test_memo_solutions():
     print("\nCall f(1) again - should still be cached:")
     print(f"f(1) = {f3(1)}")
     print()
+    
+    print("=" * 60)
+    print("PART 4: Thread-Safe Sharded LRU (max_size=64, shards=4)")
+    print("=" * 60)
+    calls = []
+    f4 = memo_lru(lambda x: calls.append(x) or x * x, max_size=64,
+                  shards=4, thread_safe=True)
+    workers = [threading.Thread(target=lambda: [f4(i) for i in range(32)])
+               for _ in range(4)]
+    for w in workers:
+        w.start()
+    for w in workers:
+        w.join()
+    assert all(f4(i) == i * i for i in range(32))
+    print(f"4 threads x 32 keys -> {len(calls)} computations, all results correct")
+    # The shards together never hold more than max_size entries
+    for max_size, shards in ((10, 16), (10, 3), (64, 4), (1, 1)):
+        f4 = memo_lru(lambda x: x, max_size=max_size, shards=shards, thread_safe=True, stats=True)
+        for i in range(1000):
+            f4(i)
+        assert f4.cache_info().currsize == max_size, (max_size, shards)
+    print()
+    
+    print("=" * 60)
+    print("PART 5: Compact Array-Backed LRU (max_size=3)")
+    print("=" * 60)
+    f5 = memo_lru(expensive_function, max_size=3, compact=True)
+    print(f"f(1) = {f5(1)}, f(2) = {f5(2)}, f(3) = {f5(3)}, f(1) = {f5(1)}")
+    print("Now call f(4) - should evict f(2):")
+    print(f"f(4) = {f5(4)}")
+    print("Call f(2) again - should recompute:")
+    print(f"f(2) = {f5(2)}")
+    print()
+    
+    print("=" * 60)
+    print("PART 6: Single-Flight + cached None results")
+    print("=" * 60)
+    calls = []
+    
+    def slow_lookup(x: int) -> Optional[int]:
+        calls.append(x)
+        time.sleep(0.05)
+        return None if x % 2 else x
+    
+    f6 = memo_lru(slow_lookup, max_size=8, thread_safe=True, max_negative=4)
+    workers = [threading.Thread(target=f6, args=(7,)) for _ in range(8)]
+    for w in workers:
+        w.start()
+    for w in workers:
+        w.join()
+    print(f"8 concurrent misses on f(7) -> {len(calls)} computation(s)")
+    assert f6(7) is None and len(calls) == 1
+    print("f(7) returned None and is served from the negative cache")
+    print()
+    
+    print("=" * 60)
+    print("PART 7: Async memo_lru_async (max_size=3)")
+    print("=" * 60)
+    asyncio.run(_demo_memo_async())
+    print()
+    
+    print("=" * 60)
+    print("PART 8: Eviction policies under a scan (max_size=4)")
+    print("=" * 60)
+    hot = [1, 2, 1, 2, 1, 2]
+    scan = list(range(100, 110))
+    for policy in POLICIES:
+        calls = []
+        f8 = memo_lru(lambda x: calls.append(x) or x, max_size=4, policy=policy)
+        for x in hot + scan + hot:
+            f8(x)
+        recomputed = sum(1 for x in calls if x in (1, 2)) - 2
+        print(f"  {policy:>8}: hot keys recomputed after scan: {recomputed}")
+    print()
+    
+    print("=" * 60)
+    print("PART 9: Weight- and TTL-bounded memo_lru")
+    print("=" * 60)
+    calls = []
+    f9 = memo_lru(lambda n: calls.append(n) or bytes(n), max_size=100, max_weight=10_000)
+    for n in (4_000, 4_001, 4_002, 4_000):
+        f9(n)
+    print(f"~4 KB results for 4000, 4001, 4002, 4000 under a 10 KB budget -> "
+          f"{len(calls)} computations (4000 was evicted by weight)")
+    calls = []
+    f9 = memo_fifo(lambda x: calls.append(x) or x, max_size=10, ttl=0.05)
+    f9(1)
+    f9(1)
+    time.sleep(0.06)
+    f9(1)
+    print(f"f(1), f(1), <ttl passes>, f(1) -> {len(calls)} computations")
+    print()
+    
+    print("=" * 60)
+    print("PART 10: On-disk L2 tier survives a restart (max_size=2)")
+    print("=" * 60)
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "memo.l2")
+        calls = []
+        f10 = memo_lru(lambda x: calls.append(x) or x * x, max_size=2, l2_path=path)
+        for x in (1, 2, 3, 1):
+            f10(x)
+        print(f"f(1), f(2), f(3), f(1) -> {len(calls)} computations (f(1) came back from L2)")
+        f10.close()
+        
+        calls.clear()
+        f10 = memo_lru(lambda x: calls.append(x) or x * x, max_size=2, l2_path=path)
+        results = [f10(x) for x in (1, 2, 3)]
+        print(f"after restart: f(1), f(2), f(3) = {results} -> {len(calls)} computations")
+        f10.close()
+
+        # Cycling keys through L1 promotes and evicts them over and over.
+        # Clean evictions are not re-appended, so the file does not grow
+        tiered = TieredCache(2, DiskTier(os.path.join(tmp, "cycle.l2"), flush_every=1))
+        sizes = []
+        for rounds in (10, 1000):
+            for _ in range(rounds):
+                for x in range(4):
+                    if tiered.get(x) is None:
+                        tiered.put(x, x * x)
+            sizes.append(os.path.getsize(tiered.l2.path))
+        tiered.close()
+        print(f"L2 file after 40 and 4040 lookups on 4 keys: {sizes[0]} / {sizes[1]} bytes")
+        assert sizes[0] == sizes[1]
+
+        # Rewriting the same keys leaves dead records: put() only appends,
+        # sync() compacts them through a temp file
+        disk = DiskTier(os.path.join(tmp, "rewrite.l2"), flush_every=4)
+        for i in range(10_000):
+            disk.put(i % 8, i)
+        appended = os.path.getsize(disk.path)
+        disk.sync()
+        print(f"10,000 writes to 8 keys -> {appended} bytes appended, "
+              f"{os.path.getsize(disk.path)} after sync()")
+        assert appended > 10_000 and os.path.getsize(disk.path) < 400
+        assert not os.path.exists(disk.path + ".tmp")
+        assert [disk.get(k) for k in range(8)] == list(range(9992, 10_000))
+        disk.close()
+        disk = DiskTier(disk.path)  # the compacted file reloads
+        assert [disk.get(k) for k in range(8)] == list(range(9992, 10_000))
+        disk.close()
+    print()
+    
+    print("=" * 60)
+    print("PART 11: Shared-memory cache across a process pool (max_size=64)")
+    print("=" * 60)
+    cache = SharedMemoryCache(64)
+    try:
+        with ProcessPoolExecutor(2, initializer=_init_shared_worker, initargs=(cache,)) as pool:
+            misses = sum(pool.map(_shared_worker_batch, [list(range(32))] * 4))
+        print(f"2 workers x 4 batches of the same 32 keys -> {misses} computations")
+    finally:
+        cache.close()
+    print()
+    
+    print("=" * 60)
+    print("PART 12: Instrumented memo_lru (max_size=3)")
+    print("=" * 60)
+    f12 = memo_lru(lambda x: x * x, max_size=3, stats=True)
+    for x in (1, 2, 3, 1, 4, 2, 1):
+        f12(x)
+    print(f12.cache_info())
+    assert f12.cache_info().evictions == 2
+
+    # Only entries dropped to make room count as evictions
+    f12 = memo_lru(lambda x: None, max_size=3, max_negative=0, stats=True)
+    for x in range(5):
+        f12(x)
+    assert f12.cache_info().evictions == 0  # None results are never stored
+    f12 = memo_lru(lambda x: x, max_size=3, ttl=0.01, stats=True)
+    f12(1)
+    time.sleep(0.02)
+    f12(1)
+    assert f12.cache_info().evictions == 0  # an expiry is not an eviction
+    f12 = memo_lru(lambda n: bytes(n), max_size=10, thread_safe=True, shards=2,
+                   max_weight=10_000, stats=True)
+    for n in (100, 200, 300):
+        f12(n)
+    assert f12.cache_info().weight == sum(sys.getsizeof(bytes(n)) for n in (100, 200, 300))
+    with tempfile.TemporaryDirectory() as tmp:
+        f12 = memo_lru(lambda x: x * x, max_size=2, l2_path=os.path.join(tmp, "memo.l2"), stats=True)
+        for x in (1, 2, 3, 1):  # 3 evicts 1; promoting 1 back from L2 evicts 2
+            f12(x)
+        info = f12.cache_info()
+        assert (info.hits, info.misses, info.evictions) == (1, 3, 2)
+        f12.close()
+    print()
+    
+    print("=" * 60)
+    print("PART 13: Batch memoized.map (max_size=4)")
+    print("=" * 60)
+    calls = []
+    
+    def square_all(xs: List[int]) -> List[int]:
+        calls.append(xs)
+        return [x * x for x in xs]
+    
+    f13 = memo_lru(lambda x: x * x, max_size=4)
+    f13(1)
+    print(f"map([1, 2, 2, 3, 1]) = {f13.map([1, 2, 2, 3, 1], batch_f=square_all)}")
+    print(f"batch_f was called once with the deduplicated misses: {calls}")
+    
+    def slow_squares(xs: List[int]) -> List[int]:
+        time.sleep(0.01)
+        return [x * x for x in xs]
+    
+    f13 = memo_lru(lambda x: x * x, max_size=4, stats=True)
+    f13.map([1, 2, 3, 4], batch_f=slow_squares)
+    snapshot = f13.snapshot()
+    assert snapshot["misses"] == 4 and snapshot["f_seconds"] >= 0.01
+    assert snapshot["mean_miss_ns"] >= 0.01e9 / 4
+    assert sum(snapshot["miss_latency_histogram"].values()) == 4
+    print()
+
+
+async def _demo_memo_async():
+    calls = []
+    
+    async def fetch(x: int) -> int:
+        calls.append(x)
+        await asyncio.sleep(0.05)
+        return x * x
+    
+    f7 = memo_lru_async(fetch, max_size=3)
+    results = await asyncio.gather(*(f7(5) for _ in range(100)))
+    print(f"100 concurrent awaits of f(5) -> {len(calls)} computation(s), result {results[0]}")
+    
+    # Cancelling one awaiter must not cancel the shared computation
+    first = asyncio.ensure_future(f7(6))
+    second = asyncio.ensure_future(f7(6))
+    await asyncio.sleep(0)
+    first.cancel()
+    print(f"f(6) after cancelling another awaiter = {await second}")
+    print(f"f(6) again (cached) = {await f7(6)}, total computations: {len(calls)}")
+
+
+# ============================================================================
+# Benchmarks
+# ============================================================================
+
+def benchmark_lru_contention(thread_counts=(1, 2, 4, 8), ops_per_thread: int = 100_000,
+                             num_keys: int = 1024, shards: int = 16) -> List[dict]:
+    """
+    Hit throughput of a shared thread-safe memo_lru, global lock vs sharded.
+    
+    Every key is pre-warmed so the loop measures pure cache hits.
+    """
+    rows = []
+    for label, n_shards in (("global lock", 1), (f"{shards} shards", shards)):
+        f = memo_lru(lambda x: x * x, max_size=num_keys, shards=n_shards, thread_safe=True)
+        for k in range(num_keys):
+            f(k)
+        for n_threads in thread_counts:
+            barrier = threading.Barrier(n_threads + 1)
+            
+            def worker(seed: int) -> None:
+                keys = [(seed * 7919 + i * 31) % num_keys for i in range(ops_per_thread)]
+                barrier.wait()
+                for k in keys:
+                    f(k)
+            
+            threads = [threading.Thread(target=worker, args=(t,)) for t in range(n_threads)]
+            for t in threads:
+                t.start()
+            barrier.wait()
+            start = time.perf_counter()
+            for t in threads:
+                t.join()
+            elapsed = time.perf_counter() - start
+            ops = n_threads * ops_per_thread
+            rows.append({"cache": label, "threads": n_threads,
+                         "hits_per_sec": ops / elapsed})
+            print(f"  {label:>12} | {n_threads:>2} threads | {ops / elapsed:>12,.0f} hits/s")
+    return rows
+
+
+def benchmark_lru_memory(num_entries: int = 200_000) -> List[dict]:
+    """
+    Memory per entry and get/put latency: LRUCache vs CompactLRUCache.
+    
+    Memory is measured with tracemalloc while filling a cache to capacity
+    with int keys/values (the int objects themselves are included).
+    Latency is measured over a shuffled access order.
+    """
+    rows = []
+    keys = list(range(num_entries))
+    access_order = keys[:]
+    random.Random(0).shuffle(access_order)
+    for cache_cls in (LRUCache, CompactLRUCache):
+        tracemalloc.start()
+        base, _ = tracemalloc.get_traced_memory()
+        cache = cache_cls(num_entries)
+        for k in keys:
+            cache.put(k, k + 1_000_000)
+        used, _ = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        
+        start = time.perf_counter()
+        for k in access_order:
+            cache.put(k, k)
+        put_ns = (time.perf_counter() - start) / num_entries * 1e9
+        start = time.perf_counter()
+        for k in access_order:
+            cache.get(k)
+        get_ns = (time.perf_counter() - start) / num_entries * 1e9
+        
+        row = {"cache": cache_cls.__name__, "bytes_per_entry": (used - base) / num_entries,
+               "get_ns": get_ns, "put_ns": put_ns}
+        rows.append(row)
+        print(f"  {row['cache']:>16} | {row['bytes_per_entry']:6.1f} B/entry | "
+              f"get {get_ns:6.0f} ns | put {put_ns:6.0f} ns")
+    return rows
+
+
+def benchmark_async_awaiters(num_awaiters: int = 20_000, num_keys: int = 100,
+                             latency: float = 0.01) -> List[dict]:
+    """
+    Many concurrent awaiters over a small key space, with and without memoization.
+    
+    Reports how many times the coroutine actually ran and the wall time.
+    """
+    async def run(wrap) -> dict:
+        calls = 0
+        
+        async def fetch(x: int) -> int:
+            nonlocal calls
+            calls += 1
+            await asyncio.sleep(latency)
+            return x
+        
+        fn = wrap(fetch)
+        start = time.perf_counter()
+        await asyncio.gather(*(fn(i % num_keys) for i in range(num_awaiters)))
+        return {"calls": calls, "seconds": time.perf_counter() - start}
+    
+    rows = []
+    for label, wrap in (("unmemoized", lambda g: g),
+                        ("memo_fifo_async", lambda g: memo_fifo_async(g, num_keys)),
+                        ("memo_lru_async", lambda g: memo_lru_async(g, num_keys))):
+        row = {"wrapper": label, **asyncio.run(run(wrap))}
+        rows.append(row)
+        print(f"  {label:>16} | {row['calls']:>6} calls of f | {row['seconds'] * 1e3:8.1f} ms")
+    return rows
+
+
+def zipf_trace(length: int, num_keys: int, skew: float = 1.0, seed: int = 0) -> List[int]:
+    """Keys drawn from a Zipf(skew) distribution over range(num_keys)."""
+    rng = random.Random(seed)
+    cum_weights, total = [], 0.0
+    for rank in range(1, num_keys + 1):
+        total += 1.0 / rank ** skew
+        cum_weights.append(total)
+    return rng.choices(range(num_keys), cum_weights=cum_weights, k=length)
+
+
+def benchmark_policy_hit_rates(max_size: int = 500, num_keys: int = 10_000,
+                               length: int = 200_000) -> List[dict]:
+    """
+    Hit ratio of every policy on a Zipfian trace with periodic one-pass scans.
+    """
+    trace = zipf_trace(length, num_keys, skew=0.9)
+    scan_key = num_keys
+    for start in range(0, length, length // 10):  # a 2*max_size scan every 10%
+        trace[start:start] = range(scan_key, scan_key + 2 * max_size)
+        scan_key += 2 * max_size
+    
+    rows = []
+    for policy, cache_cls in POLICIES.items():
+        cache, hits = cache_cls(max_size), 0
+        for key in trace:
+            if cache.get(key, _MISSING) is _MISSING:
+                cache.put(key, key)
+            else:
+                hits += 1
+        rows.append({"policy": policy, "hit_ratio": hits / len(trace)})
+        print(f"  {policy:>8} | hit ratio {hits / len(trace):6.2%}")
+    return rows
+
+
+def cpu_bound(x: int) -> int:
+    """A deliberately slow pure-Python function for process-pool benchmarks."""
+    total = 0
+    for i in range(2_000):
+        total = (total + i * x) % 1_000_003
+    return total
+
+
+_worker_memo: Optional[Callable[[int], int]] = None
+_worker_misses = 0
+
+
+def _counting_cpu_bound(x: int) -> int:
+    global _worker_misses
+    _worker_misses += 1
+    return cpu_bound(x)
+
+
+def _init_shared_worker(cache: Optional[SharedMemoryCache], max_size: int = 256) -> None:
+    """Pool initializer: shared cache if given, otherwise a private memo_lru."""
+    global _worker_memo
+    if cache is not None:
+        _worker_memo = memo_shared(_counting_cpu_bound, cache)
+    else:
+        _worker_memo = memo_lru(_counting_cpu_bound, max_size=max_size)
+
+
+def _shared_worker_batch(keys: List[int]) -> int:
+    """Evaluate keys through the worker's memo; return how many were computed."""
+    global _worker_misses
+    _worker_misses = 0
+    for k in keys:
+        _worker_memo(k)
+    return _worker_misses
+
+
+def benchmark_shared_cache(workers: int = 4, max_size: int = 1024, num_keys: int = 2_000,
+                           batches: int = 64, batch_len: int = 500) -> List[dict]:
+    """
+    Process pool over a Zipfian key stream: per-process memo_lru vs one SharedMemoryCache.
+    """
+    trace = zipf_trace(batches * batch_len, num_keys, skew=1.0)
+    work = [trace[i:i + batch_len] for i in range(0, len(trace), batch_len)]
+    rows = []
+    for label in ("per-process memo_lru", "SharedMemoryCache"):
+        cache = SharedMemoryCache(max_size) if label == "SharedMemoryCache" else None
+        try:
+            start = time.perf_counter()
+            with ProcessPoolExecutor(workers, initializer=_init_shared_worker,
+                                     initargs=(cache, max_size)) as pool:
+                misses = sum(pool.map(_shared_worker_batch, work))
+            elapsed = time.perf_counter() - start
+        finally:
+            if cache is not None:
+                cache.close()
+        row = {"cache": label, "workers": workers, "hit_ratio": 1 - misses / len(trace),
+               "seconds": elapsed,
+               "cache_bytes": (workers if cache is None else 1) * max_size}
+        rows.append(row)
+        print(f"  {label:>20} | {workers} workers | hit ratio {row['hit_ratio']:6.2%} | "
+              f"{elapsed:6.2f} s | {row['cache_bytes']} cached entries in total")
+    return rows
+
+
+def benchmark_stats_overhead(num_keys: int = 1_000, rounds: int = 200) -> List[dict]:
+    """ns per call of memo_lru with stats=False vs stats=True, for hits and misses."""
+    keys = list(range(num_keys))
+    rows = []
+    for stats in (False, True):
+        f = memo_lru(lambda x: x, max_size=num_keys, stats=stats)
+        for k in keys:
+            f(k)
+        start = time.perf_counter_ns()
+        for _ in range(rounds):
+            for k in keys:
+                f(k)
+        hit_ns = (time.perf_counter_ns() - start) / (rounds * num_keys)
+        
+        f = memo_lru(lambda x: x, max_size=1, stats=stats)
+        start = time.perf_counter_ns()
+        for k in range(rounds * num_keys):
+            f(k)
+        miss_ns = (time.perf_counter_ns() - start) / (rounds * num_keys)
+        
+        rows.append({"stats": stats, "hit_ns": hit_ns, "miss_ns": miss_ns})
+        print(f"  stats={str(stats):>5} | hit {hit_ns:6.0f} ns | miss {miss_ns:6.0f} ns")
+    on, off = rows[1], rows[0]
+    print(f"  overhead: hit +{on['hit_ns'] - off['hit_ns']:.0f} ns, "
+          f"miss +{on['miss_ns'] - off['miss_ns']:.0f} ns")
+    return rows
+
+
+def benchmark_batch_map(batch_size: int = 5_000, num_keys: int = 20_000,
+                        max_size: int = 10_000, rounds: int = 20) -> List[dict]:
+    """Per-key memo_lru calls vs memoized.map over the same Zipfian batches."""
+    batches = [zipf_trace(batch_size, num_keys, skew=0.9, seed=r) for r in range(rounds)]
+    rows = []
+    for label in ("per-key loop", "memoized.map"):
+        f = memo_lru(lambda x: x * x, max_size=max_size)
+        start = time.perf_counter()
+        for batch in batches:
+            if label == "memoized.map":
+                f.map(batch)
+            else:
+                [f(x) for x in batch]
+        ns = (time.perf_counter() - start) / (rounds * batch_size) * 1e9
+        rows.append({"mode": label, "ns_per_key": ns})
+        print(f"  {label:>13} | {ns:6.0f} ns/key")
+    return rows
+
+
+def run_benchmarks():
+    print("=" * 60)
+    print("Thread contention: shared memo_lru hit throughput")
+    print("=" * 60)
+    benchmark_lru_contention()
+    print()
+    
+    print("=" * 60)
+    print("Memory and latency: LRUCache vs CompactLRUCache")
+    print("=" * 60)
+    benchmark_lru_memory()
+    print()
+    
+    print("=" * 60)
+    print("asyncio: 20,000 concurrent awaiters over 100 keys")
+    print("=" * 60)
+    benchmark_async_awaiters()
+    print()
+    
+    print("=" * 60)
+    print("Eviction policies: Zipf(0.9) trace with periodic scans")
+    print("=" * 60)
+    benchmark_policy_hit_rates()
+    print()
+    
+    print("=" * 60)
+    print("Process pool: per-process memo_lru vs SharedMemoryCache")
+    print("=" * 60)
+    benchmark_shared_cache()
+    print()
+    
+    print("=" * 60)
+    print("Instrumentation overhead: memo_lru stats=False vs stats=True")
+    print("=" * 60)
+    benchmark_stats_overhead()
+    print()
+    
+    print("=" * 60)
+    print("Batch lookups: per-key loop vs memoized.map")
+    print("=" * 60)
+    benchmark_batch_map()
+    print()
 
 
 # ============================================================================
@@ -303,6 +2562,9 @@ The key insight is that we need TWO data structures:
 
 
 if __name__ == "__main__":
-    test_memo_solutions()
+    if len(sys.argv) > 1 and sys.argv[1] == "bench":
+        run_benchmarks()
+    else:
+        test_memo_solutions()
 
 
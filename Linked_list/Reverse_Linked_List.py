@@ -8,10 +8,7 @@ class ListNode:
         self.next = next
 class Solution:
     def reverseList(self, head: Optional[ListNode]) -> Optional[ListNode]:
-        # I want to switch the path of these by creating a dummy node then deleting the dummy node recursively 
-        d = ListNode("temp")
-        d.next = head
-
+        # Walk the list once, pointing each node back at the one before it
         prev = None
         current = head
     
@@ -21,4 +18,4 @@ class Solution:
             prev = current
             current = next_node
             
-        return d.next
\ No newline at end of file
+        return prev
\ No newline at end of file
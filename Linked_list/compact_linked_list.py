@@ -0,0 +1,267 @@
+# Compact singly-linked lists: struct-of-arrays instead of one object per node.
+#
+# A ListNode costs a Python object (plus its __dict__ and boxed ints) per node,
+# so 10^7 nodes take gigabytes, and every hop is an attribute lookup. Here a
+# node is just an index into two typed arrays:
+#
+#     val[i]  - the node's value   (array('q') by default, 8 bytes)
+#     next[i] - index of the next node, or NIL (-1) for None (array('q'), 8 bytes)
+#
+# Several lists can live in the same pool and share nodes (tails), which is what
+# getIntersectionNode needs. Heads are plain ints.
+#
+# Run from the repo root: python -m Linked_list.compact_linked_list (add "bench" for the benchmark)
+
+import sys
+import time
+import tracemalloc
+from array import array
+from typing import Callable, Iterable, Iterator, List, Optional
+
+from Linked_list.Reverse_Linked_List import ListNode, Solution as ReverseSolution
+from Linked_list.intersection_linked_list import Solution as IntersectionSolution
+
+NIL = -1
+
+
+class ArrayLinkedList:
+    def __init__(self, values: Iterable = (), typecode: str = "q"):
+        self.val = array(typecode)
+        self.next = array("q")
+        self.head = self.append_chain(values)
+
+    # ------------------------------------------------------------------
+    # Building and converting - all O(n)
+    # ------------------------------------------------------------------
+
+    def append_chain(self, values: Iterable, tail: int = NIL) -> int:
+        """
+        Add a new chain holding `values` to the pool and return its head.
+        Its last node points at `tail`, so chains can share a tail.
+        """
+        start = len(self.val)
+        self.val.extend(values)
+        end = len(self.val)
+        if end == start:
+            return tail
+        # Nodes are laid out in order: next[i] = i + 1, last one -> tail
+        self.next.extend(range(start + 1, end + 1))
+        self.next[end - 1] = tail
+        return start
+
+    @classmethod
+    def from_listnodes(cls, heads: List[Optional[ListNode]], typecode: str = "q"):
+        """
+        Convert ListNode chains into one pool. Shared nodes stay shared.
+        Returns (pool, [head index for each input head]).
+        """
+        pool = cls(typecode=typecode)
+        index = {}  # id(ListNode) -> node index
+        head_indexes = []
+        for head in heads:
+            # Copy nodes until we reach one that is already in the pool
+            start, prev, node = NIL, NIL, head
+            while node is not None and id(node) not in index:
+                i = len(pool.val)
+                index[id(node)] = i
+                pool.val.append(node.val)
+                pool.next.append(NIL)
+                if prev == NIL:
+                    start = i
+                else:
+                    pool.next[prev] = i
+                prev, node = i, node.next
+            joined = index[id(node)] if node is not None else NIL
+            if prev == NIL:
+                start = joined
+            else:
+                pool.next[prev] = joined
+            head_indexes.append(start)
+        if head_indexes:
+            pool.head = head_indexes[0]
+        return pool, head_indexes
+
+    def to_listnode(self, head: Optional[int] = None) -> Optional[ListNode]:
+        """Build a ListNode chain with the values from `head` (default self.head)."""
+        dummy = tail = ListNode(0)
+        for value in self.values(head):
+            tail.next = ListNode(value)
+            tail = tail.next
+        return dummy.next
+
+    def values(self, head: Optional[int] = None) -> Iterator:
+        val, nxt = self.val, self.next
+        i = self.head if head is None else head
+        while i != NIL:
+            yield val[i]
+            i = nxt[i]
+
+    def __iter__(self) -> Iterator:
+        return self.values()
+
+    def to_list(self, head: Optional[int] = None) -> list:
+        return list(self.values(head))
+
+    # ------------------------------------------------------------------
+    # Native versions of the list algorithms in this folder
+    # ------------------------------------------------------------------
+
+    def reverseList(self, head: Optional[int] = None) -> int:
+        """Reverse the chain at `head` in place and return the new head. O(n)"""
+        nxt = self.next
+        prev, current = NIL, self.head if head is None else head
+        while current != NIL:
+            next_node = nxt[current]
+            nxt[current] = prev
+            prev = current
+            current = next_node
+        if head is None or head == self.head:
+            self.head = prev
+        return prev
+
+    def getIntersectionNode(self, headA: int, headB: int) -> int:
+        """Two-pointer intersection on indices; NIL if the chains don't meet. O(n + m)"""
+        if headA == NIL or headB == NIL:
+            return NIL
+        nxt = self.next
+        pointerA, pointerB = headA, headB
+        while pointerA != pointerB:
+            pointerA = nxt[pointerA] if pointerA != NIL else headB
+            pointerB = nxt[pointerB] if pointerB != NIL else headA
+        return pointerA
+
+    def delete_node(self, val, head: Optional[int] = None) -> int:
+        """
+        Unlink the first node whose value is `val` (like String/temp_linked_list.py)
+        and return the head. The slot is not reused. O(n)
+        """
+        values, nxt = self.val, self.next
+        first = self.head if head is None else head
+        prev, current = NIL, first
+        while current != NIL:
+            if values[current] == val:
+                if prev == NIL:
+                    first = nxt[current]
+                else:
+                    nxt[prev] = nxt[current]
+                break
+            prev, current = current, nxt[current]
+        if head is None or head == self.head:
+            self.head = first
+        return first
+
+    def delete_nodes(self, values: Optional[Iterable] = None, pred: Optional[Callable] = None,
+                     head: Optional[int] = None):
+        """
+        Unlink every node whose value is in `values` (or satisfies `pred`) in one
+        pass. Returns (new head, number of nodes removed). O(n)
+        """
+        if (values is None) == (pred is None):
+            raise ValueError("pass exactly one of values or pred")
+        if pred is None:
+            pred = (values if isinstance(values, (set, frozenset)) else set(values)).__contains__
+        val, nxt = self.val, self.next
+        first = self.head if head is None else head
+        removed = 0
+        while first != NIL and pred(val[first]):
+            first = nxt[first]
+            removed += 1
+        prev = first
+        current = nxt[prev] if prev != NIL else NIL
+        while current != NIL:
+            if pred(val[current]):
+                removed += 1
+            else:
+                nxt[prev] = current  # relink past any run of removed nodes
+                prev = current
+            current = nxt[current]
+        if prev != NIL:
+            nxt[prev] = NIL
+        if head is None or head == self.head:
+            self.head = first
+        return first, removed
+
+
+# ============================================================================
+# Benchmark: ListNode chains vs ArrayLinkedList
+# ============================================================================
+
+def _build_listnodes(n: int) -> Optional[ListNode]:
+    head = None
+    for value in range(n - 1, -1, -1):
+        head = ListNode(value, head)
+    return head
+
+
+def benchmark_compact_lists(n: int = 1_000_000) -> List[dict]:
+    """Memory per node, reverseList and getIntersectionNode (two n/2 chains sharing n/2 nodes)."""
+    rows = []
+
+    tracemalloc.start()
+    head = _build_listnodes(n)
+    nodes_bytes, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    start = time.perf_counter()
+    head = ReverseSolution().reverseList(head)
+    reverse_s = time.perf_counter() - start
+    middle = head
+    for _ in range(n // 2):
+        middle = middle.next
+    other = ListNode(-1, middle)
+    start = time.perf_counter()
+    IntersectionSolution().getIntersectionNode(head, other)
+    intersect_s = time.perf_counter() - start
+    rows.append({"impl": "ListNode", "bytes_per_node": nodes_bytes / n,
+                 "reverse_s": reverse_s, "intersect_s": intersect_s})
+    del head, middle, other
+
+    tracemalloc.start()
+    compact = ArrayLinkedList(range(n))
+    compact_bytes, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    start = time.perf_counter()
+    compact.reverseList()
+    reverse_s = time.perf_counter() - start
+    middle = compact.head
+    for _ in range(n // 2):
+        middle = compact.next[middle]
+    other = compact.append_chain([-1], tail=middle)
+    start = time.perf_counter()
+    compact.getIntersectionNode(compact.head, other)
+    intersect_s = time.perf_counter() - start
+    rows.append({"impl": "ArrayLinkedList", "bytes_per_node": compact_bytes / n,
+                 "reverse_s": reverse_s, "intersect_s": intersect_s})
+
+    for row in rows:
+        print(f"  {row['impl']:>15} | {row['bytes_per_node']:6.1f} B/node | "
+              f"reverseList {row['reverse_s'] * 1e3:7.1f} ms | "
+              f"getIntersectionNode {row['intersect_s'] * 1e3:7.1f} ms | n={n:,}")
+    return rows
+
+
+if __name__ == "__main__":
+    lst = ArrayLinkedList([1, 2, 3, 4, 5])
+    lst.reverseList()
+    assert lst.to_list() == [5, 4, 3, 2, 1]
+    lst.delete_node(3)
+    assert lst.to_list() == [5, 4, 2, 1]
+    assert lst.delete_nodes({5, 2, 1}) == (lst.head, 3) and lst.to_list() == [4]
+
+    # Two chains sharing the tail [8, 4, 5]
+    pool = ArrayLinkedList()
+    shared = pool.append_chain([8, 4, 5])
+    a = pool.append_chain([4, 1], tail=shared)
+    b = pool.append_chain([5, 6, 1], tail=shared)
+    assert pool.getIntersectionNode(a, b) == shared
+
+    # Converting ListNode chains keeps a shared tail shared
+    tail = ListNode(8, ListNode(4, ListNode(5)))
+    heads = [ListNode(4, ListNode(1, tail)), ListNode(5, ListNode(6, ListNode(1, tail)))]
+    pool2, (a2, b2) = ArrayLinkedList.from_listnodes(heads)
+    assert pool2.to_list(a2) == [4, 1, 8, 4, 5] and pool2.to_list(b2) == [5, 6, 1, 8, 4, 5]
+    assert pool2.val[pool2.getIntersectionNode(a2, b2)] == 8 and len(pool2.val) == 8
+    assert pool2.to_listnode(a2).next.next.val == 8
+    print("All tests passed!")
+
+    if len(sys.argv) > 1 and sys.argv[1] == "bench":
+        benchmark_compact_lists()
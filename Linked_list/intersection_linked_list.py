@@ -3,8 +3,12 @@
 #     def __init__(self, x):
 #         self.val = x
 #         self.next = None
+#
+# Run from the repo root: python -m Linked_list.intersection_linked_list (add "bench" for the benchmark)
 
-from typing import Optional
+import sys
+import time
+from typing import Dict, List, Optional, Tuple
 from Linked_list.Reverse_Linked_List import ListNode
 
 
@@ -22,4 +26,119 @@ class Solution:
         
         return pointerA
 
-#Given the heads of two singly linked-lists headA and headB, return the node at which the two lists intersect. If the two linked lists have no intersection at all, return null.
\ No newline at end of file
+    def getIntersectionNodes(self, heads: List[Optional[ListNode]]) -> Dict[Tuple[int, int], ListNode]:
+        """
+        First shared node for every pair of intersecting lists among N heads.
+
+        Returns {(i, j): node} for i < j, only for pairs that intersect.
+
+        1. Walk each list once, stopping at the first node an earlier list
+           already visited. Every node is visited once in total, and list i
+           owns the segment of nodes it reached first.
+        2. Lists only ever merge, so segments form a tree: segment i hangs
+           off the segment that owns the node where list i stopped, at that
+           node's position.
+        3. Bottom-up over the tree (children were created later, so reverse
+           order works), two lists that reach segment s through different
+           branches first meet at s[max(their entry positions)].
+
+        Time: O(total nodes + number of intersecting pairs)
+        Space: O(total nodes)
+        """
+        owner = {}  # id(node) -> (list that reached it first, position in that list's segment)
+        segments = []
+        attached = [[] for _ in heads]  # segment -> [(entry position, [lists entering there])]
+        parent = [None] * len(heads)
+        for i, head in enumerate(heads):
+            segment, node = [], head
+            while node is not None and id(node) not in owner:
+                owner[id(node)] = (i, len(segment))
+                segment.append(node)
+                node = node.next
+            segments.append(segment)
+            if node is None:
+                continue
+            o, position = owner[id(node)]
+            if segment:
+                parent[i] = (o, position)
+            else:
+                attached[o].append((position, [i]))  # list i starts inside o's segment
+
+        pairs = {}
+        for s in range(len(heads) - 1, -1, -1):
+            segment = segments[s]
+            if not segment:
+                continue
+            groups = [(0, [s])] + attached[s]
+            for g, (pos_a, lists_a) in enumerate(groups):
+                for pos_b, lists_b in groups[g + 1:]:
+                    meet = segment[max(pos_a, pos_b)]
+                    for a in lists_a:
+                        for b in lists_b:
+                            pairs[(a, b) if a < b else (b, a)] = meet
+            if parent[s] is not None:
+                o, position = parent[s]
+                attached[o].append((position, [i for _, lists in groups for i in lists]))
+            attached[s] = None
+        return pairs
+
+#Given the heads of two singly linked-lists headA and headB, return the node at which the two lists intersect. If the two linked lists have no intersection at all, return null.
+
+
+def benchmark_intersection_nodes(lists: int = 3_000, tail: int = 100_000, branch: int = 100) -> None:
+    """
+    `lists` lists of 1..branch own nodes, all merging into one shared tail.
+    Lengths differ, so a pairwise two-pointer walk covers both lists.
+    """
+    shared = None
+    for v in range(tail):
+        shared = ListNode(v, shared)
+    heads = []
+    for i in range(lists):
+        head = shared
+        for v in range(1 + i % branch):
+            head = ListNode(v, head)
+        heads.append(head)
+
+    start = time.perf_counter()
+    pairs = Solution().getIntersectionNodes(heads)
+    elapsed = time.perf_counter() - start
+    print(f"  getIntersectionNodes: {lists:,} lists, {tail:,}-node shared tail -> "
+          f"{len(pairs):,} pairs in {elapsed * 1e3:8.1f} ms")
+    sample = heads[:40]
+    start = time.perf_counter()
+    for i in range(len(sample)):
+        for j in range(i + 1, len(sample)):
+            Solution().getIntersectionNode(sample[i], sample[j])
+    per_pair = (time.perf_counter() - start) / (len(sample) * (len(sample) - 1) // 2)
+    print(f"  pairwise getIntersectionNode: {per_pair * 1e3:8.2f} ms per pair "
+          f"(~{per_pair * len(pairs):,.0f} s for all pairs)")
+
+
+if __name__ == "__main__":
+    import random
+
+    for trial in range(300):
+        # A random forest of nodes: every node points at an earlier one or
+        # None, so any node heads a list, and lists only ever merge
+        nodes = []
+        for v in range(random.randrange(1, 40)):
+            nodes.append(ListNode(v, random.choice(nodes + [None] * 3)))
+        heads = [random.choice(nodes + [None]) for _ in range(random.randrange(1, 12))]
+        if len(heads) > 1:
+            heads.append(heads[random.randrange(len(heads))])  # the same head twice
+        pairs = Solution().getIntersectionNodes(heads)
+        expected = {}
+        for i in range(len(heads)):
+            for j in range(i + 1, len(heads)):
+                meet = Solution().getIntersectionNode(heads[i], heads[j])
+                if meet is not None:
+                    expected[(i, j)] = meet
+        assert pairs.keys() == expected.keys()
+        assert all(pairs[pair] is expected[pair] for pair in pairs)
+    assert Solution().getIntersectionNodes([]) == {}
+    assert Solution().getIntersectionNodes([None, None]) == {}
+    print("All tests passed!")
+
+    if len(sys.argv) > 1 and sys.argv[1] == "bench":
+        benchmark_intersection_nodes()
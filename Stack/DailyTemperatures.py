@@ -1,8 +1,18 @@
+import sys
+import time
+from array import array
+from typing import Iterable, Iterator, List, Optional, Tuple
+
+try:
+    import numpy as np
+except ImportError:  # NumPy is only needed for daily_temperatures_numpy
+    np = None
+
+
 class Solution:
     def dailyTemperatures(self, temperatures: List[int]) -> List[int]:
         res = [0]*len(temperatures)
-        stack = [] #pair 
-        print(temperatures)
+        stack = [] #pair
 
         for i, t in enumerate(temperatures):
             while stack and t > stack[-1][0]:
@@ -10,4 +20,224 @@ class Solution:
                 res[stackInd] = i - stackInd
             stack.append((t, i))
         return res
-        
\ No newline at end of file
+
+
+class NextWarmerStream:
+    """
+    Online dailyTemperatures: feed readings one at a time and get each
+    (index, wait_days) as soon as it resolves, i.e. on the first warmer day.
+
+    The monotonic stack lives in two parallel typed arrays (temps, days)
+    instead of a list of (t, i) tuples: 16 bytes per pending reading with
+    the default typecodes, and no tuple allocated per push. The default
+    typecode 'd' takes int and float readings (ints exactly up to 2**53);
+    'q' stores exact 64-bit ints only.
+
+    max_horizon bounds memory: a reading still waiting after max_horizon
+    days is emitted as (index, 0) - the same "no warmer day" answer as
+    the end of the input - and dropped, so at most max_horizon + 1
+    readings are pending.
+    """
+
+    def __init__(self, max_horizon: Optional[int] = None, typecode: str = "d"):
+        if max_horizon is not None and max_horizon < 1:
+            raise ValueError("max_horizon must be >= 1")
+        self.max_horizon = max_horizon
+        self.temps = array(typecode)
+        self.days = array("q")
+        self.base = 0  # expired readings below base are deleted in bulk
+        self.day = 0
+
+    def push(self, t) -> List[Tuple[int, int]]:
+        """Add the next reading; returns the answers it resolves. Amortized O(1)"""
+        temps, days, day = self.temps, self.days, self.day
+        resolved = []
+        while len(temps) > self.base and t > temps[-1]:
+            temps.pop()
+            index = days.pop()
+            resolved.append((index, day - index))
+        if self.max_horizon is not None:
+            # The oldest pending readings sit at the bottom of the stack
+            while self.base < len(days) and day - days[self.base] >= self.max_horizon:
+                resolved.append((days[self.base], 0))
+                self.base += 1
+            if self.base > 1024 and 2 * self.base > len(days):
+                del temps[:self.base]
+                del days[:self.base]
+                self.base = 0
+        temps.append(t)
+        days.append(day)
+        self.day = day + 1
+        return resolved
+
+    def feed(self, readings: Iterable) -> Iterator[Tuple[int, int]]:
+        for t in readings:
+            yield from self.push(t)
+
+    def flush(self) -> List[Tuple[int, int]]:
+        """End of input: every pending reading never sees a warmer day."""
+        pending = [(index, 0) for index in self.days[self.base:]]
+        del self.temps[:]
+        del self.days[:]
+        self.base = 0
+        return pending
+
+    def __len__(self) -> int:
+        return len(self.days) - self.base
+
+
+def stream_daily_temperatures(readings: Iterable, max_horizon: Optional[int] = None,
+                              typecode: str = "d") -> Iterator[Tuple[int, int]]:
+    """Yield (index, wait_days) for every reading, in resolution order."""
+    stream = NextWarmerStream(max_horizon, typecode)
+    yield from stream.feed(readings)
+    yield from stream.flush()
+
+
+def _first_greater(values, start, thresh, block: int):
+    """
+    For each query q, the first position p >= start[q] with
+    values[p] > thresh[q], or len(values) if there is none.
+
+    1. the rest of start's own block: a (queries x block) comparison
+    2. later blocks: binary lifting over a sparse table of block maxima
+       finds the first block whose max beats the threshold, then one more
+       (queries x block) comparison finds the position inside it.
+    O((queries + len(values)) * (block + log(len(values)))) vectorized work.
+    """
+    m = len(values)
+    nb = -(-m // block)
+    low = -np.inf if np.issubdtype(values.dtype, np.floating) else np.iinfo(values.dtype).min
+    padded = np.full(nb * block, low, dtype=values.dtype)
+    padded[:m] = values
+    grid = padded.reshape(nb, block)
+    result = np.full(len(start), m, dtype=np.int64)
+
+    live = np.flatnonzero(start < m)
+    b, col = np.divmod(start[live], block)
+    hits = (grid[b] > thresh[live, None]) & (np.arange(block) >= col[:, None])
+    found = hits.any(axis=1)
+    result[live[found]] = b[found] * block + hits[found].argmax(axis=1)
+
+    live, pos = live[~found], b[~found] + 1
+    t = thresh[live]
+    table = [grid.max(axis=1)]
+    while (1 << len(table)) <= nb:
+        prev, step = table[-1], 1 << (len(table) - 1)
+        table.append(np.maximum(prev[:-step], prev[step:]))
+    for level in range(len(table) - 1, -1, -1):
+        span = table[level]  # span[k] = max of blocks k .. k + 2**level - 1
+        ok = np.flatnonzero(pos < len(span))
+        ok = ok[span[pos[ok]] <= t[ok]]
+        pos[ok] += 1 << level
+    inside = pos < nb
+    live, pos, t = live[inside], pos[inside], t[inside]
+    result[live] = pos * block + (grid[pos] > t[:, None]).argmax(axis=1)
+    return result
+
+
+def daily_temperatures_numpy(temperatures, chunk_size: int = 1 << 18, block: int = 32):
+    """
+    Offline batch mode with the same answers as dailyTemperatures, for
+    arrays far larger than a Python list should hold (e.g. 10^8 readings
+    from np.memmap).
+
+    Chunks are processed in order. Inside a chunk, waits of up to 8 days
+    come from shifted compares and longer ones from _first_greater. Readings still unresolved at the end of a chunk are
+    carried, as parallel index/temperature arrays, into the next chunks.
+    Like the stack, the carry is non-increasing in temperature. So only
+    its top - the readings colder than the chunk's max - can resolve
+    there, and each one is looked up once.
+    """
+    if np is None:
+        raise ImportError("daily_temperatures_numpy requires NumPy")
+    a = np.asarray(temperatures)
+    n = len(a)
+    res = np.zeros(n, dtype=np.int64)
+    carry_idx = np.empty(0, dtype=np.int64)
+    carry_t = np.empty(0, dtype=a.dtype)
+    for lo in range(0, n, chunk_size):
+        chunk = np.ascontiguousarray(a[lo:lo + chunk_size])
+        m = len(chunk)
+        local = np.arange(m, dtype=np.int64)
+
+        # Most waits are short: try the next few days with shifted compares
+        # and leave only the rest to _first_greater
+        nxt = np.full(m, m, dtype=np.int64)
+        open_ = local
+        for d in range(1, 9):
+            open_ = open_[open_ + d < m]
+            warmer = chunk[open_ + d] > chunk[open_]
+            nxt[open_[warmer]] = open_[warmer] + d
+            open_ = open_[~warmer]
+        nxt[open_] = _first_greater(chunk, open_ + 9, chunk[open_], block)
+        done = nxt < m
+        res[lo + local[done]] = nxt[done] - local[done]
+
+        # carry_t is non-increasing: the ones colder than the chunk's max are a suffix
+        keep = len(carry_t) - np.searchsorted(carry_t[::-1], chunk.max(), side="left")
+        if keep < len(carry_t):
+            top_idx, top_t = carry_idx[keep:], carry_t[keep:]
+            res[top_idx] = lo + _first_greater(chunk, np.zeros(len(top_t), dtype=np.int64), top_t, block) - top_idx
+
+        carry_idx = np.concatenate((carry_idx[:keep], lo + local[~done]))
+        carry_t = np.concatenate((carry_t[:keep], chunk[~done]))
+    return res
+
+
+def benchmark_daily_temperatures(n: int = 2_000_000) -> None:
+    import random
+    rng = random.Random(0)
+    # A slow seasonal swing plus daily noise, in tenths of a degree
+    temps = [int(150 + 100 * ((i % 365) / 182.5 - 1) ** 2 + rng.randrange(-40, 40)) for i in range(n)]
+
+    start = time.perf_counter()
+    expected = Solution().dailyTemperatures(temps)
+    print(f"  dailyTemperatures (list)     {(time.perf_counter() - start) / n * 1e9:6.0f} ns/reading")
+
+    for horizon in (None, 30):
+        stream = NextWarmerStream(horizon)
+        peak = 0
+        start = time.perf_counter()
+        for t in temps:
+            stream.push(t)
+            if len(stream) > peak:
+                peak = len(stream)
+        stream.flush()
+        print(f"  NextWarmerStream(horizon={horizon}) {(time.perf_counter() - start) / n * 1e9:6.0f} ns/reading,"
+              f" peak {peak} pending")
+
+    if np is not None:
+        arr = np.array(temps, dtype=np.int32)
+        start = time.perf_counter()
+        got = daily_temperatures_numpy(arr)
+        print(f"  daily_temperatures_numpy     {(time.perf_counter() - start) / n * 1e9:6.0f} ns/reading")
+        assert got.tolist() == expected
+
+
+if __name__ == "__main__":
+    import random
+
+    assert Solution().dailyTemperatures([73, 74, 75, 71, 69, 72, 76, 73]) == [1, 1, 4, 2, 1, 1, 0, 0]
+    assert sorted(stream_daily_temperatures([70.5, 71.2, 69.0])) == [(0, 1), (1, 0), (2, 0)]
+    for trial in range(200):
+        temps = [random.randrange(random.choice((3, 30, 100))) for _ in range(random.randrange(300))]
+        if trial % 10 == 0:
+            temps.sort(reverse=trial % 20 == 0)
+        expected = Solution().dailyTemperatures(temps)
+        assert sorted(stream_daily_temperatures(temps)) == list(enumerate(expected))
+        assert sorted(stream_daily_temperatures(temps, typecode="q")) == list(enumerate(expected))
+        floats = [t + random.random() for t in temps]
+        assert sorted(stream_daily_temperatures(floats)) == \
+            list(enumerate(Solution().dailyTemperatures(floats)))
+        horizon = random.randrange(1, 20)
+        assert sorted(stream_daily_temperatures(temps, horizon)) == \
+            [(i, w if w <= horizon else 0) for i, w in enumerate(expected)]
+        if np is not None:
+            for chunk_size, block in ((7, 2), (64, 4), (1 << 18, 32)):
+                got = daily_temperatures_numpy(np.array(temps, dtype=np.int64), chunk_size, block)
+                assert got.tolist() == expected
+    print("All tests passed!")
+
+    if len(sys.argv) > 1 and sys.argv[1] == "bench":
+        benchmark_daily_temperatures()
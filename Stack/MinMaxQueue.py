@@ -0,0 +1,199 @@
+# Streaming sliding-window min/max.
+#
+# Three ways to get the min and max of the last W readings at every tick,
+# all amortized O(1) per reading instead of rescanning the window (O(W)):
+#
+# 1. MinMaxQueue - a FIFO queue built from two CompressedMinStacks (the
+#    classic "queue from two stacks"): push onto `inbox`, pop from `outbox`,
+#    and refill `outbox` by reversing `inbox` when it runs dry. Each stack
+#    already answers getMin/getMax in O(1), so the queue does too.
+# 2. sliding_min_max - monotonic deques, consumed lazily from any iterator.
+# 3. sliding_min_max_numpy - van Herk / Gil-Werman block prefix/suffix
+#    extrema, vectorized over a whole array of readings.
+#
+# Every mode yields one (min, max) per reading; the first W-1 ticks cover
+# the partial window of readings seen so far.
+#
+# Run from the repo root: python -m Stack.MinMaxQueue (add "bench" for the benchmark)
+
+import sys
+import time
+from collections import deque
+from typing import Iterable, Iterator, Optional, Tuple
+
+from Stack.MinimumStack import CompressedMinStack
+
+try:
+    import numpy as np
+except ImportError:  # NumPy is only needed for the batch mode
+    np = None
+
+
+class MinMaxQueue:
+    def __init__(self, typecode: Optional[str] = None):
+        self.inbox = CompressedMinStack(typecode)
+        self.outbox = CompressedMinStack(typecode)
+
+    def push(self, val) -> None:
+        self.inbox.push(val)
+
+    def popleft(self):
+        if not len(self.outbox):
+            # Refill: the oldest element ends up on top. O(k), amortized O(1)
+            self.outbox.push_many(reversed(self.inbox.values))
+            self.inbox.pop_many(len(self.inbox))
+        val = self.outbox.top()
+        self.outbox.pop()
+        return val
+
+    def getMin(self):
+        if not len(self.outbox):
+            return self.inbox.getMin()
+        if not len(self.inbox):
+            return self.outbox.getMin()
+        return min(self.inbox.getMin(), self.outbox.getMin())
+
+    def getMax(self):
+        if not len(self.outbox):
+            return self.inbox.getMax()
+        if not len(self.inbox):
+            return self.outbox.getMax()
+        return max(self.inbox.getMax(), self.outbox.getMax())
+
+    def __len__(self) -> int:
+        return len(self.inbox) + len(self.outbox)
+
+    @classmethod
+    def windowed(cls, readings: Iterable, window: int,
+                 typecode: Optional[str] = None) -> Iterator[Tuple]:
+        """Yield (min, max) of the last `window` readings, one per reading."""
+        if window < 1:
+            raise ValueError("window must be >= 1")
+        queue = cls(typecode)
+        for val in readings:
+            queue.push(val)
+            if len(queue) > window:
+                queue.popleft()
+            yield queue.getMin(), queue.getMax()
+
+
+def sliding_min_max(readings: Iterable, window: int) -> Iterator[Tuple]:
+    """
+    Monotonic-deque window aggregator: yield (min, max) of the last `window`
+    readings, one per reading, lazily.
+
+    lows holds indices with increasing values (front = min), highs indices
+    with decreasing values (front = max). Every index enters and leaves each
+    deque once: amortized O(1) per reading, O(window) memory.
+    """
+    if window < 1:
+        raise ValueError("window must be >= 1")
+    lows, highs = deque(), deque()  # (index, value)
+    for i, val in enumerate(readings):
+        while lows and lows[-1][1] >= val:
+            lows.pop()
+        lows.append((i, val))
+        while highs and highs[-1][1] <= val:
+            highs.pop()
+        highs.append((i, val))
+        oldest = i - window
+        if lows[0][0] == oldest:
+            lows.popleft()
+        if highs[0][0] == oldest:
+            highs.popleft()
+        yield lows[0][1], highs[0][1]
+
+
+def sliding_min_max_numpy(readings, window: int):
+    """
+    Batch mode: (mins, maxs) arrays, same values as sliding_min_max.
+
+    van Herk / Gil-Werman: split the readings into blocks of `window`; a
+    full window [i-w+1, i] spans at most two blocks, so its extreme is
+    combine(suffix extreme of its start block, prefix extreme of its end
+    block). Three vectorized passes, O(n) regardless of window.
+    """
+    if np is None:
+        raise ImportError("sliding_min_max_numpy requires NumPy")
+    if window < 1:
+        raise ValueError("window must be >= 1")
+    a = np.asarray(readings)
+    n = len(a)
+    if n == 0 or window == 1:
+        return a.copy(), a.copy()
+    w = min(window, n)
+    blocks = -(-n // w)
+
+    def extremes(ufunc, pad):
+        padded = np.full(blocks * w, pad, dtype=a.dtype)
+        padded[:n] = a
+        grid = padded.reshape(blocks, w)
+        prefix = ufunc.accumulate(grid, axis=1).ravel()
+        suffix = ufunc.accumulate(grid[:, ::-1], axis=1)[:, ::-1].ravel()
+        out = np.empty(n, dtype=a.dtype)
+        out[:w - 1] = ufunc.accumulate(a[:w - 1])  # warm-up: partial windows
+        out[w - 1:] = ufunc(suffix[:n - w + 1], prefix[w - 1:n])
+        return out
+
+    if np.issubdtype(a.dtype, np.floating):
+        lo_pad, hi_pad = np.inf, -np.inf
+    else:
+        info = np.iinfo(a.dtype)
+        lo_pad, hi_pad = info.max, info.min
+    return extremes(np.minimum, lo_pad), extremes(np.maximum, hi_pad)
+
+
+def _naive(readings, window: int) -> Iterator[Tuple]:
+    """The O(W)-per-tick rescan this module replaces."""
+    for i in range(len(readings)):
+        win = readings[max(0, i - window + 1):i + 1]
+        yield min(win), max(win)
+
+
+def benchmark_windows(windows=(10, 1_000, 100_000, 1_000_000), ticks: int = 200) -> None:
+    """ns per reading for each mode over window + 10^5 readings."""
+    import random
+    rng = random.Random(0)
+    for window in windows:
+        n = window + 100_000
+        readings = [rng.randrange(1_000_000) for _ in range(n)]
+        timings = {}
+
+        # naive rescan of `ticks` full windows - the whole stream would take hours at W=10^6
+        start = time.perf_counter()
+        for i in range(window - 1, window - 1 + ticks):
+            win = readings[i - window + 1:i + 1]
+            min(win), max(win)
+        timings["naive rescan"] = (time.perf_counter() - start) / ticks
+
+        for label, fn in (("MinMaxQueue", lambda r: MinMaxQueue.windowed(r, window, "q")),
+                          ("monotonic deque", lambda r: sliding_min_max(r, window))):
+            start = time.perf_counter()
+            for _ in fn(readings):
+                pass
+            timings[label] = (time.perf_counter() - start) / n
+
+        if np is not None:
+            arr = np.array(readings, dtype=np.int64)
+            start = time.perf_counter()
+            sliding_min_max_numpy(arr, window)
+            timings["numpy batch"] = (time.perf_counter() - start) / n
+
+        print(f"  W={window:>9,}: " + " | ".join(f"{k} {v * 1e9:8.0f} ns/reading" for k, v in timings.items()))
+
+
+if __name__ == "__main__":
+    import random
+
+    data = [random.randrange(50) for _ in range(2_000)]
+    for window in (1, 3, 17, 500, 5_000):
+        expected = list(_naive(data, window))
+        assert list(sliding_min_max(iter(data), window)) == expected
+        assert list(MinMaxQueue.windowed(data, window)) == expected
+        if np is not None:
+            mins, maxs = sliding_min_max_numpy(np.array(data), window)
+            assert list(zip(mins.tolist(), maxs.tolist())) == expected
+    print("All tests passed!")
+
+    if len(sys.argv) > 1 and sys.argv[1] == "bench":
+        benchmark_windows()
@@ -1,3 +1,8 @@
+import sys
+from array import array
+from typing import Iterable, Optional
+
+
 class MinStack:
 
     def __init__(self):
@@ -23,4 +28,192 @@ class MinStack:
         return self.minstck[-1]
 
 
-        
+class CompressedMinStack:
+    """
+    MinStack that stores run-length encoded min/max history instead of a
+    duplicate minimum per element, and also supports getMax.
+
+    For both min and max we keep a stack of runs (pos, count) covering the
+    top `count` elements:
+    - pos >= 0: the extreme of every element in the run is values[pos]
+      (it didn't change while the run was pushed)
+    - pos == SELF: every element in the run is its own extreme (each push
+      set a new min/max, e.g. the max of an increasing stream)
+    A push extends the top run whenever the extreme keeps the same kind, so
+    a mostly-monotonic stream needs O(1) runs for both min and max, and
+    memory is just the values: one machine word per element with
+    typecode='q' (or 'd').
+
+    All operations are O(1); push_many/pop_many are O(k) amortized with the
+    values copied in one C-level extend/delete.
+    """
+
+    SELF = -1
+
+    def __init__(self, typecode: Optional[str] = None):
+        # typecode=None stores any comparable objects in a list
+        self.values = [] if typecode is None else array(typecode)
+        self.min_pos, self.min_cnt = array("q"), array("q")
+        self.max_pos, self.max_cnt = array("q"), array("q")
+
+    def _extreme_pos(self, pos, top: int) -> int:
+        """Position of the current extreme given the top run's pos."""
+        return top if pos[-1] == self.SELF else pos[-1]
+
+    def _record(self, pos, cnt, is_new_extreme: bool, top: int) -> None:
+        """Add one element (at index top + 1) to a run stack. O(1)"""
+        if not pos:
+            pos.append(self.SELF)
+            cnt.append(1)
+        elif is_new_extreme:
+            if pos[-1] == self.SELF:
+                cnt[-1] += 1
+            else:
+                pos.append(self.SELF)
+                cnt.append(1)
+        else:
+            extreme = self._extreme_pos(pos, top)
+            if pos[-1] == extreme:
+                cnt[-1] += 1
+            else:
+                pos.append(extreme)
+                cnt.append(1)
+
+    @staticmethod
+    def _drop(pos, cnt, k: int) -> None:
+        """Remove the top k elements from a run stack. O(runs removed)"""
+        while k:
+            take = min(k, cnt[-1])
+            cnt[-1] -= take
+            k -= take
+            if not cnt[-1]:
+                pos.pop()
+                cnt.pop()
+
+    def push(self, val) -> None:
+        values = self.values
+        top = len(values) - 1
+        if values:
+            new_min = val < values[self._extreme_pos(self.min_pos, top)]
+            new_max = val > values[self._extreme_pos(self.max_pos, top)]
+        else:
+            new_min = new_max = True
+        self._record(self.min_pos, self.min_cnt, new_min, top)
+        self._record(self.max_pos, self.max_cnt, new_max, top)
+        values.append(val)
+
+    def push_many(self, vals: Iterable) -> None:
+        start = len(self.values)
+        self.values.extend(vals)
+        values = self.values
+        min_pos, min_cnt, max_pos, max_cnt = self.min_pos, self.min_cnt, self.max_pos, self.max_cnt
+        SELF = self.SELF
+        if start == len(values):
+            return
+        if start == 0:
+            for pos, cnt in ((min_pos, min_cnt), (max_pos, max_cnt)):
+                pos.append(SELF)
+                cnt.append(1)
+            start = 1
+        # Same logic as push(), with the current extremes kept in locals
+        lo_pos = self._extreme_pos(min_pos, start - 1)
+        hi_pos = self._extreme_pos(max_pos, start - 1)
+        lo, hi = values[lo_pos], values[hi_pos]
+        for i in range(start, len(values)):
+            val = values[i]
+            if val < lo:
+                if min_pos[-1] != SELF:
+                    min_pos.append(SELF)
+                    min_cnt.append(0)
+                min_cnt[-1] += 1
+                lo, lo_pos = val, i
+            else:
+                if min_pos[-1] != lo_pos:
+                    min_pos.append(lo_pos)
+                    min_cnt.append(0)
+                min_cnt[-1] += 1
+            if val > hi:
+                if max_pos[-1] != SELF:
+                    max_pos.append(SELF)
+                    max_cnt.append(0)
+                max_cnt[-1] += 1
+                hi, hi_pos = val, i
+            else:
+                if max_pos[-1] != hi_pos:
+                    max_pos.append(hi_pos)
+                    max_cnt.append(0)
+                max_cnt[-1] += 1
+
+    def pop(self) -> None:
+        self.values.pop()
+        self._drop(self.min_pos, self.min_cnt, 1)
+        self._drop(self.max_pos, self.max_cnt, 1)
+
+    def pop_many(self, k: int) -> None:
+        if k > len(self.values):
+            raise IndexError("pop_many from a stack with fewer than k elements")
+        if k <= 0:
+            return
+        del self.values[-k:]
+        self._drop(self.min_pos, self.min_cnt, k)
+        self._drop(self.max_pos, self.max_cnt, k)
+
+    def top(self):
+        return self.values[-1]
+
+    def getMin(self):
+        return self.values[self._extreme_pos(self.min_pos, len(self.values) - 1)]
+
+    def getMax(self):
+        return self.values[self._extreme_pos(self.max_pos, len(self.values) - 1)]
+
+    def __len__(self) -> int:
+        return len(self.values)
+
+
+def benchmark_min_stacks(n: int = 1_000_000) -> None:
+    import random
+    import tracemalloc
+    # Mostly increasing: rising readings with an occasional dip
+    stream = [i - (50 if random.random() < 0.001 else 0) for i in range(n)]
+    for label, make in (("MinStack", MinStack), ("CompressedMinStack('q')", lambda: CompressedMinStack("q"))):
+        tracemalloc.start()
+        st = make()
+        if label == "MinStack":
+            for v in stream:
+                st.push(v)
+        else:
+            st.push_many(stream)
+        used, _ = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        print(f"  {label:>24}: {used / n:5.1f} bytes/element for {n:,} pushes")
+
+
+if __name__ == "__main__":
+    import random
+
+    for typecode in (None, "q"):
+        s, reference = CompressedMinStack(typecode), []
+        for _ in range(20_000):
+            op = random.random()
+            if op < 0.5 or not reference:
+                v = random.randrange(100)
+                s.push(v)
+                reference.append(v)
+            elif op < 0.6:
+                batch = [random.randrange(100) for _ in range(random.randrange(5))]
+                s.push_many(batch)
+                reference.extend(batch)
+            elif op < 0.7:
+                k = random.randrange(len(reference) + 1)
+                s.pop_many(k)
+                del reference[len(reference) - k:]
+            else:
+                s.pop()
+                reference.pop()
+            if reference:
+                assert (s.top(), s.getMin(), s.getMax()) == (reference[-1], min(reference), max(reference))
+    print("All tests passed!")
+
+    if len(sys.argv) > 1 and sys.argv[1] == "bench":
+        benchmark_min_stacks()
@@ -1,4 +1,15 @@
-from typing import List
+import math
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import shared_memory
+from typing import Callable, Hashable, Iterable, List, Optional, Union
+
+try:
+    import numpy as np
+except ImportError:  # NumPy is only needed for the *_numpy / parallel modes
+    np = None
 
 
 class Solution:
@@ -7,11 +18,283 @@ class Solution:
         # 1. The while loop condition nums[i] will raise IndexError when i >= len(nums)
         # 2. We're incrementing nums[i] instead of adding to dictionary
         # 3. We never check the full array due to while loop condition
-        
+        # 4. Looking up in a list is O(n) per check -> O(n^2) overall; a set is O(1)
+
         # Here's the corrected version:
-        seen = []
-        for num in nums:
+        return self.firstDuplicate(nums) != -1
+
+    def firstDuplicate(self, nums: Iterable[Hashable]) -> int:
+        # Position of the first element equal to an earlier one, or -1
+        seen = set()
+        for i, num in enumerate(nums):
+            if num in seen:
+                return i
+            seen.add(num)
+        return -1
+
+
+# ============================================================================
+# Bitset: ints in a known range [lo, hi], one bit per possible value
+# ============================================================================
+
+def first_duplicate_bitset(nums: List[int], lo: Optional[int] = None, hi: Optional[int] = None) -> int:
+    """firstDuplicate for ints in [lo, hi] using (hi - lo + 1) / 8 bytes."""
+    if not nums:
+        return -1
+    if lo is None or hi is None:
+        lo, hi = min(nums), max(nums)
+    elif min(nums) < lo or max(nums) > hi:
+        raise ValueError(f"values must lie in [lo, hi] = [{lo}, {hi}]")
+    bits = bytearray(((hi - lo) >> 3) + 1)
+    for i, num in enumerate(nums):
+        num -= lo
+        byte, mask = num >> 3, 1 << (num & 7)
+        if bits[byte] & mask:
+            return i
+        bits[byte] |= mask
+    return -1
+
+
+def first_duplicate_bitset_numpy(nums, lo: Optional[int] = None, hi: Optional[int] = None,
+                                 chunk_size: int = 1 << 16) -> int:
+    """
+    Vectorized bitset mode: a bool per value in [lo, hi], filled chunk by
+    chunk so an early duplicate stops the scan. In a chunk, a position is
+    a duplicate if its value was marked by an earlier chunk, or if it
+    repeats a value inside the chunk (found by a stable sort).
+    """
+    if np is None:
+        raise ImportError("first_duplicate_bitset_numpy requires NumPy")
+    a = np.asarray(nums)
+    if len(a) == 0:
+        return -1
+    if lo is None or hi is None:
+        lo, hi = int(a.min()), int(a.max())
+    elif a.min() < lo or a.max() > hi:
+        raise ValueError(f"values must lie in [lo, hi] = [{lo}, {hi}]")
+    seen = np.zeros(hi - lo + 1, dtype=bool)
+    for start in range(0, len(a), chunk_size):
+        vals = a[start:start + chunk_size].astype(np.int64) - lo
+        dups = np.flatnonzero(seen[vals])
+        first = dups[0] if len(dups) else len(vals)
+        order = np.argsort(vals, kind="stable")
+        repeats = order[1:][vals[order[1:]] == vals[order[:-1]]]
+        if len(repeats):
+            first = min(first, repeats.min())
+        if first < len(vals):
+            return start + int(first)
+        seen[vals] = True
+    return -1
+
+
+# ============================================================================
+# Bloom filter pre-screen
+# ============================================================================
+
+_MASK64 = (1 << 64) - 1
+
+
+class BloomFilter:
+    """
+    Bit array of m bits with k hash positions per item (double hashing
+    from the item's hash). add() reports whether every position was
+    already set: False means "definitely new", True means "maybe seen".
+    m and k are sized for `capacity` items at `error_rate` false positives.
+    """
+
+    def __init__(self, capacity: int, error_rate: float = 0.01):
+        capacity = max(capacity, 1)
+        self.m = max(8, math.ceil(-capacity * math.log(error_rate) / math.log(2) ** 2))
+        self.k = max(1, round(self.m / capacity * math.log(2)))
+        self.bits = bytearray((self.m + 7) >> 3)
+
+    def add(self, item: Hashable) -> bool:
+        h = hash(item) & _MASK64
+        # int hashes are the ints themselves: mix before deriving positions
+        h1 = (h * 0x9E3779B97F4A7C15) & _MASK64
+        h2 = (((h ^ (h >> 31)) * 0xBF58476D1CE4E5B9) & _MASK64) | 1
+        bits, m = self.bits, self.m
+        present = True
+        for i in range(self.k):
+            pos = (h1 + i * h2) % m
+            byte, mask = pos >> 3, 1 << (pos & 7)
+            if not bits[byte] & mask:
+                present = False
+                bits[byte] |= mask
+        return present
+
+
+def first_duplicate_bloom(nums: Union[Iterable[Hashable], Callable[[], Iterable[Hashable]]],
+                          capacity: int, error_rate: float = 0.01) -> int:
+    """
+    firstDuplicate for streams too large for an exact set of every item.
+
+    Pass 1 runs every item through a Bloom filter. Items it flags are
+    candidates: every real repeat is flagged, plus about error_rate * n
+    false positives. Pass 2 replays the stream and tracks exact positions
+    for candidate values only, stopping at the first real repeat. Memory is
+    the filter plus the candidates. `nums` must be re-iterable: a sequence,
+    or a zero-argument callable returning a fresh iterator.
+    """
+    if not callable(nums) and iter(nums) is nums:
+        raise TypeError("nums is a one-shot iterator; pass a sequence or a callable returning a fresh iterator")
+    replay = nums if callable(nums) else (lambda: nums)
+    bloom = BloomFilter(capacity, error_rate)
+    candidates = set()
+    for num in replay():
+        if bloom.add(num):
+            candidates.add(num)
+    if not candidates:
+        return -1
+    seen = set()
+    for i, num in enumerate(replay()):
+        if num in candidates:
             if num in seen:
-                return True
-            seen.append(num)
-        return False
\ No newline at end of file
+                return i
+            seen.add(num)
+    return -1
+
+
+# ============================================================================
+# Process pool: partition by value over shared memory
+# ============================================================================
+
+def _first_duplicate_in_part(shm_name: str, n: int, dtype: str, part: int, parts: int,
+                             chunk_size: int = 1 << 20) -> int:
+    """
+    First repeat among positions whose value % parts == part, or n.
+    The partition is picked out one chunk at a time, so temporaries are
+    O(chunk_size) plus the ~n / parts positions kept.
+    """
+    shm = shared_memory.SharedMemory(name=shm_name)
+    try:
+        a = np.ndarray((n,), dtype=dtype, buffer=shm.buf)
+        idx = np.concatenate([np.flatnonzero(a[lo:lo + chunk_size] % parts == part) + lo
+                              for lo in range(0, n, chunk_size)])
+        vals = a[idx]
+        order = np.argsort(vals, kind="stable")
+        repeats = idx[order[1:][vals[order[1:]] == vals[order[:-1]]]]
+        del a, vals
+        return int(repeats.min()) if len(repeats) else n
+    finally:
+        shm.close()
+
+
+def first_duplicate_parallel(nums, workers: Optional[int] = None) -> int:
+    """
+    firstDuplicate for large integer arrays over several processes.
+
+    Equal values always land in the same partition (value % parts), so each
+    worker finds the first repeat of its own values independently. The
+    answer is the smallest of these. The array is shared through one
+    shared_memory block instead of being pickled to every worker.
+    """
+    if np is None:
+        raise ImportError("first_duplicate_parallel requires NumPy")
+    a = np.ascontiguousarray(nums)
+    if not np.issubdtype(a.dtype, np.integer):
+        raise TypeError("first_duplicate_parallel needs an integer array")
+    n = len(a)
+    if n < 2:
+        return -1
+    parts = workers or os.cpu_count() or 1
+    shm = shared_memory.SharedMemory(create=True, size=a.nbytes)
+    try:
+        np.ndarray(a.shape, dtype=a.dtype, buffer=shm.buf)[:] = a
+        with ProcessPoolExecutor(parts) as pool:
+            firsts = list(pool.map(_first_duplicate_in_part, [shm.name] * parts, [n] * parts,
+                                   [a.dtype.str] * parts, range(parts), [parts] * parts))
+    finally:
+        shm.close()
+        shm.unlink()
+    first = min(firsts)
+    return first if first < n else -1
+
+
+def _first_duplicate_list(nums: List[int]) -> int:
+    """The original list-membership scan, for the benchmark."""
+    seen = []
+    for i, num in enumerate(nums):
+        if num in seen:
+            return i
+        seen.append(num)
+    return -1
+
+
+def benchmark_duplicates(n: int = 1_000_000) -> None:
+    import random
+    rng = random.Random(0)
+    # Worst case for early exit: distinct values, one repeat at the very end
+    nums = rng.sample(range(4 * n), n)
+    nums[-1] = nums[n // 2]
+    expected = n - 1
+
+    small = nums[:20_000]
+    start = time.perf_counter()
+    _first_duplicate_list(small)
+    print(f"  list scan (old)   n={len(small):>9,}: {(time.perf_counter() - start) * 1e3:8.1f} ms")
+
+    modes = [
+        ("set", lambda: Solution().firstDuplicate(nums)),
+        ("bitset bytearray", lambda: first_duplicate_bitset(nums, 0, 4 * n)),
+        ("bloom 1%", lambda: first_duplicate_bloom(nums, n, 0.01)),
+    ]
+    if np is not None:
+        arr = np.array(nums, dtype=np.int64)
+        modes.append(("bitset numpy", lambda: first_duplicate_bitset_numpy(arr, 0, 4 * n)))
+        modes.append(("parallel x2", lambda: first_duplicate_parallel(arr, 2)))
+    for label, run in modes:
+        start = time.perf_counter()
+        assert run() == expected
+        print(f"  {label:<17} n={n:>9,}: {(time.perf_counter() - start) * 1e3:8.1f} ms")
+
+
+if __name__ == "__main__":
+    import random
+
+    assert Solution().containsDuplicate([1, 2, 3, 1])
+    assert not Solution().containsDuplicate([1, 2, 3, 4])
+    assert Solution().firstDuplicate([1, 1, 1, 3, 3, 4, 3, 2, 4, 2]) == 1
+    assert Solution().firstDuplicate([]) == -1
+
+    for trial in range(200):
+        nums = [random.randrange(-50, random.randrange(1, 500)) for _ in range(random.randrange(100))]
+        expected = _first_duplicate_list(nums)
+        assert Solution().firstDuplicate(nums) == expected
+        assert first_duplicate_bitset(nums) == expected
+        assert first_duplicate_bloom(nums, len(nums), 0.05) == expected
+        assert first_duplicate_bloom(lambda: iter(nums), 4, 0.5) == expected  # saturated filter
+        if np is not None:
+            assert first_duplicate_bitset_numpy(nums, chunk_size=random.choice((1, 7, 1 << 16))) == expected
+            if trial < 3:
+                assert first_duplicate_parallel(np.array(nums, dtype=np.int64), 2) == expected
+            if trial < 20 and len(nums) >= 2:
+                shm = shared_memory.SharedMemory(create=True, size=8 * len(nums))
+                try:
+                    np.ndarray((len(nums),), dtype=np.int64, buffer=shm.buf)[:] = nums
+                    firsts = [_first_duplicate_in_part(shm.name, len(nums), "<i8", part, 3, chunk_size=7)
+                              for part in range(3)]
+                finally:
+                    shm.close()
+                    shm.unlink()
+                assert (min(firsts) if min(firsts) < len(nums) else -1) == expected
+
+    bitsets = [first_duplicate_bitset] + ([first_duplicate_bitset_numpy] if np is not None else [])
+    for bad in ([15, -1], [0, 16]):
+        for run in bitsets:
+            try:
+                run(bad, 0, 15)
+            except ValueError:
+                pass
+            else:
+                raise AssertionError(f"{run.__name__} accepted {bad} outside [0, 15]")
+    try:
+        first_duplicate_bloom(iter([1, 2, 1]), 3)
+    except TypeError:
+        pass
+    else:
+        raise AssertionError("first_duplicate_bloom accepted a one-shot iterator")
+    print("All tests passed!")
+
+    if len(sys.argv) > 1 and sys.argv[1] == "bench":
+        benchmark_duplicates()
@@ -14,4 +14,26 @@ def delete_node(head, val):
             return d.next   # 3
         p = c
         c = c.next
-    return d.next # 4 
\ No newline at end of file
+    return d.next # 4
+
+
+def delete_nodes(head, values=None, pred=None):
+    # Delete every node whose val is in `values` (or satisfies `pred`) in one pass.
+    # Returns (new head, number of nodes removed). O(n), no dummy node allocated.
+    # Linked_list/compact_linked_list.py has the same for array-backed lists.
+    if (values is None) == (pred is None):
+        raise ValueError("pass exactly one of values or pred")
+    if pred is None:
+        pred = (values if isinstance(values, (set, frozenset)) else set(values)).__contains__
+    removed = 0
+    while head and pred(head.val): # 1 drop matching nodes at the front
+        head = head.next
+        removed += 1
+    p = head
+    while p and p.next:
+        if pred(p.next.val):
+            p.next = p.next.next # 2 unlink, stay on p to check the new next
+            removed += 1
+        else:
+            p = p.next
+    return head, removed
@@ -1,19 +1,160 @@
 # Problem Statement:
-# Given an array of integers nums and an integer target, 
-# return indices of the two numbers such that they add up to the target. 
+# Given an array of integers nums and an integer target,
+# return indices of the two numbers such that they add up to the target.
 # You may assume that each input would have exactly one solution, and you may not use the same element twice.
 
+import sys
+import time
+from typing import Dict, Iterable, List, Optional, Tuple
+
+try:
+    import numpy as np
+except ImportError:  # NumPy is only needed for query_many's vectorized path
+    np = None
+
+try:
+    from String.two_sum2 import pair_indices_sorted
+except ImportError:  # run as a script: python String/two_sum.py
+    from two_sum2 import pair_indices_sorted
+
+
 def twosum(nums, target):
     dic = {}
     for i, num in enumerate(nums):
         com = target - num
         if com in dic:
-            return i, dic[com] 
+            return i, dic[com]
         else:
             dic[num]=i
     return None
 
-nums = [2, 7, 11, 15]
-target = 9
-print(twosum(nums, target))  # Output: [0, 1]
-            
\ No newline at end of file
+
+class TwoSumIndex:
+    """
+    twosum for many targets against the same array: the array is indexed
+    once instead of once per target.
+
+    - positions: value -> positions in nums, ascending (query)
+    - sorted values plus the argsort order (NumPy only, query_many)
+    - for arrays with at most max_pairs pairs, every pair sum, sorted, built
+      on the first query_many: each target is then one binary search
+
+    Answers are (i, j) with i > j and nums[i] + nums[j] == target, or None.
+    When the target has exactly one solution (the problem's guarantee) this
+    is the same pair twosum returns. With several solutions, any valid
+    pair may come back.
+    """
+
+    def __init__(self, nums: List[int], max_pairs: int = 1 << 22):
+        self.nums = nums
+        self.positions: Dict[int, List[int]] = {}
+        for i, num in enumerate(nums):
+            self.positions.setdefault(num, []).append(i)
+        self.max_pairs = max_pairs
+        self.pair_sums = None  # (sums, l, r) in sorted-value space, built lazily
+        if np is not None:
+            arr = np.asarray(nums)
+            self.order = np.argsort(arr, kind="stable")
+            self.sorted_vals = arr[self.order]
+
+    def query(self, target) -> Optional[Tuple[int, int]]:
+        """One target: dict lookups only, O(distinct values) worst case."""
+        positions = self.positions
+        for num, where in positions.items():
+            com = target - num
+            if com == num:
+                if len(where) > 1:
+                    return where[1], where[0]
+            elif com in positions:
+                i, j = where[0], positions[com][0]
+                return (i, j) if i > j else (j, i)
+        return None
+
+    def _pairs_table(self):
+        if self.pair_sums is None:
+            l, r = np.triu_indices(len(self.sorted_vals), 1)
+            sums = self.sorted_vals[l] + self.sorted_vals[r]
+            by_sum = np.argsort(sums, kind="stable")
+            self.pair_sums = sums[by_sum], l[by_sum], r[by_sum]
+        return self.pair_sums
+
+    def query_many(self, targets: Iterable) -> List[Optional[Tuple[int, int]]]:
+        """All targets at once, vectorized (NumPy), else per target."""
+        targets = list(targets)
+        n = len(self.nums)
+        if np is None or n < 2:
+            return [self.query(t) for t in targets]
+        t = np.asarray(targets)
+        if n * (n - 1) // 2 <= self.max_pairs:
+            sums, ls, rs = self._pairs_table()
+            k = np.minimum(np.searchsorted(sums, t), len(sums) - 1)
+            left = np.where(sums[k] == t, ls[k], -1)
+            right = np.where(sums[k] == t, rs[k], -1)
+        else:
+            left, right = pair_indices_sorted(self.sorted_vals, t)
+        found = left >= 0
+        i = np.where(found, self.order[np.maximum(left, 0)], -1)
+        j = np.where(found, self.order[np.maximum(right, 0)], -1)
+        i, j = np.maximum(i, j).tolist(), np.minimum(i, j).tolist()
+        return [None if b < 0 else (a, b) for a, b in zip(i, j)]
+
+
+def benchmark_two_sum(n: int = 2_000, queries: int = 20_000) -> None:
+    import random
+    rng = random.Random(0)
+    nums = rng.sample(range(10 ** 7), n)
+    # Half the targets have a solution, half (almost surely) don't
+    targets = [nums[rng.randrange(n)] + nums[rng.randrange(n)] if q % 2 else rng.randrange(2 * 10 ** 7)
+               for q in range(queries)]
+
+    start = time.perf_counter()
+    expected = [twosum(nums, t) for t in targets]
+    base = time.perf_counter() - start
+    print(f"  twosum per target:       {base * 1e3:8.1f} ms  ({queries:,} targets, n={n:,})")
+
+    start = time.perf_counter()
+    index = TwoSumIndex(nums)
+    build = time.perf_counter() - start
+    start = time.perf_counter()
+    got = [index.query(t) for t in targets]
+    elapsed = time.perf_counter() - start
+    assert [g is None for g in got] == [e is None for e in expected]
+    print(f"  TwoSumIndex.query:       {elapsed * 1e3:8.1f} ms  (+{build * 1e3:.1f} ms build)")
+
+    if np is not None:
+        for label, max_pairs in (("searchsorted", 0), ("pair sums", 1 << 22)):
+            index = TwoSumIndex(nums, max_pairs)
+            start = time.perf_counter()
+            got = index.query_many(targets)
+            elapsed = time.perf_counter() - start
+            assert [g is None for g in got] == [e is None for e in expected]
+            print(f"  query_many ({label}): {elapsed * 1e3:8.1f} ms  (first call, includes any table build)")
+
+
+if __name__ == "__main__":
+    nums = [2, 7, 11, 15]
+    target = 9
+    print(twosum(nums, target))  # Output: (1, 0)
+
+    import random
+    for _ in range(300):
+        nums = [random.randrange(-20, 20) for _ in range(random.randrange(10))]
+        index, searchsorted_only = TwoSumIndex(nums), TwoSumIndex(nums, max_pairs=0)
+        targets = [random.randrange(-45, 45) for _ in range(40)]
+        for t, a, b, c in zip(targets, [index.query(t) for t in targets], index.query_many(targets),
+                              searchsorted_only.query_many(targets)):
+            expected = twosum(nums, t)
+            for got in (a, b, c):
+                assert (got is None) == (expected is None)
+                if got is not None:
+                    i, j = got
+                    assert i > j and nums[i] + nums[j] == t
+        # Exactly one solution: same pair as twosum
+        distinct = random.sample(range(0, 1000, 3), 8)
+        t = distinct[2] + distinct[5] + 1  # no pair of multiples of 3 sums to 1 mod 3
+        distinct[5] += 1
+        assert TwoSumIndex(distinct).query(t) == TwoSumIndex(distinct).query_many([t])[0] == twosum(distinct, t)
+    print("All tests passed!")
+
+    if len(sys.argv) > 1 and sys.argv[1] == "bench":
+        benchmark_two_sum()
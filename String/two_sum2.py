@@ -1,6 +1,14 @@
-# Problem Statement: Given a 1-indexed array nums of distinct integers, and an integer target, 
+# Problem Statement: Given a 1-indexed array nums of distinct integers, and an integer target,
 # find the two numbers such that they add up to the target.
 
+import sys
+
+try:
+    import numpy as np
+except ImportError:  # NumPy is only needed for the batch mode
+    np = None
+
+
 def sumII(nums, target):
     l = 0
     r = len(nums)-1
@@ -9,7 +17,7 @@ def sumII(nums, target):
         sum = nums[r] + nums[l]
         if sum == target:
             return (nums[r],  nums[l])
-        elif (sum) < 0:
+        elif (sum) < target:
             l += 1
         else:
             r -= 1
@@ -17,6 +25,78 @@ def sumII(nums, target):
 
     return None
 
-nums = [2, 7, 11, 15]
-target = 9
-print(sumII(nums, target))  # Output: [1, 2]
\ No newline at end of file
+
+def pair_indices_sorted(nums, targets, block: int = 1 << 22):
+    """
+    Batch sumII over one sorted array: for every target, the (l, r)
+    indices the two-pointer scan would stop at, or (-1, -1).
+
+    For each target, the scan stops at the smallest l that has a
+    partner, and for that l at the largest r > l with
+    nums[r] == target - nums[l]. So all complements target - nums[l] are
+    looked up with searchsorted (side="right", minus one for the last
+    occurrence), and the first l with a partner is taken. Targets are
+    processed in groups of about `block` (target, l) cells to bound memory.
+    O(len(nums) log len(nums)) per target, all in C.
+    """
+    if np is None:
+        raise ImportError("pair_indices_sorted requires NumPy")
+    s = np.asarray(nums)
+    t = np.asarray(targets)
+    n = len(s)
+    left = np.full(len(t), -1, dtype=np.int64)
+    right = np.full(len(t), -1, dtype=np.int64)
+    if n < 2:
+        return left, right
+    cols = np.arange(n)
+    step = max(1, block // n)
+    for lo in range(0, len(t), step):
+        comp = t[lo:lo + step, None] - s[None, :]
+        r = np.searchsorted(s, comp, side="right") - 1
+        ok = (r > cols) & (s[np.maximum(r, 0)] == comp)
+        found = ok.any(axis=1)
+        l = ok.argmax(axis=1)
+        rows = np.flatnonzero(found)
+        left[lo + rows] = l[rows]
+        right[lo + rows] = r[rows, l[rows]]
+    return left, right
+
+
+def sumII_many(nums, targets):
+    """sumII for many targets at once; same results as calling it per target."""
+    left, right = pair_indices_sorted(nums, targets)
+    return [None if l < 0 else (nums[r], nums[l]) for l, r in zip(left.tolist(), right.tolist())]
+
+
+def benchmark_sumII(n: int = 2_000, queries: int = 20_000) -> None:
+    import random
+    import time
+    rng = random.Random(0)
+    nums = sorted(rng.sample(range(10 ** 7), n))
+    targets = [nums[rng.randrange(n)] + nums[rng.randrange(n)] if q % 2 else rng.randrange(2 * 10 ** 7)
+               for q in range(queries)]
+    start = time.perf_counter()
+    expected = [sumII(nums, t) for t in targets]
+    print(f"  sumII per target: {(time.perf_counter() - start) * 1e3:8.1f} ms  ({queries:,} targets, n={n:,})")
+    start = time.perf_counter()
+    assert sumII_many(nums, targets) == expected
+    print(f"  sumII_many:       {(time.perf_counter() - start) * 1e3:8.1f} ms")
+
+
+if __name__ == "__main__":
+    nums = [2, 7, 11, 15]
+    target = 9
+    print(sumII(nums, target))  # Output: (7, 2)
+
+    import random
+    for _ in range(200):
+        nums = sorted(random.randrange(-30, 30) for _ in range(random.randrange(12)))
+        targets = [random.randrange(-70, 70) for _ in range(50)]
+        expected = [sumII(nums, t) for t in targets]
+        if np is not None:
+            assert sumII_many(nums, targets) == expected
+            assert sumII_many(nums[:3], targets[:1]) == [sumII(nums[:3], targets[0])]
+    print("All tests passed!")
+
+    if len(sys.argv) > 1 and sys.argv[1] == "bench" and np is not None:
+        benchmark_sumII()
@@ -1,4 +1,9 @@
-from typing import List
+import sys
+import time
+import tracemalloc
+from bisect import bisect_left
+from itertools import accumulate, islice
+from typing import Iterator, List, Tuple, Union
 
 
 class Solution:
@@ -20,11 +25,182 @@ class Solution:
                         l+=1
                     while l < r and nums[r]==nums[r-1]:
                         r-=1
+                    # step past the pair we just used, or this loops forever
+                    l+=1
+                    r-=1
                 elif rem > 0:
-                    l +=1
+                    r -=1
                     continue
                 else:
-                    r -=1
+                    l +=1
                     continue
 
         return final
+
+    def kSum(self, nums: List[int], k: int, target: int) -> List[List[int]]:
+        return k_sum(nums, k, target)
+
+
+# ============================================================================
+# k-sum: sort once, recurse down to the two-pointer scan above
+#
+# Every level prunes with prefix sums of the sorted array: from position i
+# the smallest reachable sum is nums[i] + ... + nums[i+k-1] (if that already
+# exceeds the target, so does everything after i - stop), and the largest
+# is nums[i] + the k-1 largest values (if that is still short, skip i).
+# Equal values at the same level are skipped, so each distinct tuple of
+# values is produced once, in ascending order.
+# ============================================================================
+
+def _k_sum_iter(nums: List[int], pre: List[int], k: int, target: int, start: int,
+                prefix: List[int]) -> Iterator[Tuple[int, ...]]:
+    n = len(nums)
+    if k == 1:
+        j = bisect_left(nums, target, start)
+        if j < n and nums[j] == target:
+            yield (*prefix, target)
+        return
+    if k == 2:
+        l, r = start, n - 1
+        while l < r:
+            s = nums[l] + nums[r]
+            if s < target:
+                l += 1
+            elif s > target:
+                r -= 1
+            else:
+                yield (*prefix, nums[l], nums[r])
+                l += 1
+                r -= 1
+                while l < r and nums[l] == nums[l - 1]:
+                    l += 1
+        return
+    largest_rest = pre[n] - pre[n - k + 1]
+    for i in range(start, n - k + 1):
+        if i > start and nums[i] == nums[i - 1]:
+            continue
+        if pre[i + k] - pre[i] > target:
+            break
+        if nums[i] + largest_rest < target:
+            continue
+        prefix.append(nums[i])
+        yield from _k_sum_iter(nums, pre, k - 1, target - nums[i], i + 1, prefix)
+        prefix.pop()
+
+
+def _k_sum_count(nums: List[int], pre: List[int], k: int, target: int, start: int) -> int:
+    """Same walk as _k_sum_iter, counting instead of building tuples."""
+    n = len(nums)
+    if k == 1:
+        j = bisect_left(nums, target, start)
+        return int(j < n and nums[j] == target)
+    if k == 2:
+        count = 0
+        l, r = start, n - 1
+        while l < r:
+            s = nums[l] + nums[r]
+            if s < target:
+                l += 1
+            elif s > target:
+                r -= 1
+            else:
+                count += 1
+                l += 1
+                r -= 1
+                while l < r and nums[l] == nums[l - 1]:
+                    l += 1
+        return count
+    count = 0
+    largest_rest = pre[n] - pre[n - k + 1]
+    for i in range(start, n - k + 1):
+        if i > start and nums[i] == nums[i - 1]:
+            continue
+        if pre[i + k] - pre[i] > target:
+            break
+        if nums[i] + largest_rest < target:
+            continue
+        count += _k_sum_count(nums, pre, k - 1, target - nums[i], i + 1)
+    return count
+
+
+def k_sum(nums: List[int], k: int, target: int = 0,
+          mode: str = "list") -> Union[List[List[int]], Iterator[Tuple[int, ...]], int]:
+    """
+    Every distinct k-tuple of values from nums (ascending) that sums to target.
+
+    mode="list":  List[List[int]], like threeSum
+    mode="iter":  a lazy generator of tuples; memory is O(n + k) however
+                  many tuples there are
+    mode="count": just the number of tuples, none built
+
+    O(n log n) to sort, then O(n^(k-1)) worst case before pruning.
+    """
+    if k < 1:
+        raise ValueError("k must be >= 1")
+    if mode not in ("list", "iter", "count"):
+        raise ValueError(f"unknown mode {mode!r}")
+    nums = sorted(nums)
+    if len(nums) < k:
+        return iter(()) if mode == "iter" else (0 if mode == "count" else [])
+    pre = [0, *accumulate(nums)]
+    if mode == "count":
+        return _k_sum_count(nums, pre, k, target, 0)
+    tuples = _k_sum_iter(nums, pre, k, target, 0, [])
+    return tuples if mode == "iter" else [list(t) for t in tuples]
+
+
+def benchmark_k_sum(n: int = 2_000, big_n: int = 100_000) -> None:
+    import random
+    rng = random.Random(0)
+    nums = [rng.randrange(-n, n) for _ in range(n)]
+
+    for mode in ("list", "count"):
+        tracemalloc.start()
+        start = time.perf_counter()
+        result = k_sum(nums, 3, 0, mode)
+        elapsed = time.perf_counter() - start
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        count = result if mode == "count" else len(result)
+        print(f"  3-sum n={n:,} mode={mode:<5}: {elapsed * 1e3:8.1f} ms | {count:,} triples | "
+              f"peak {peak / 2**20:6.1f} MiB")
+
+    # 10^5 elements: far too many triples to hold, but the generator
+    # only keeps the sort and the recursion's prefix
+    big = [rng.randrange(-big_n, big_n) for _ in range(big_n)]
+    tracemalloc.start()
+    start = time.perf_counter()
+    taken = sum(1 for _ in islice(k_sum(big, 3, 0, "iter"), 100_000))
+    elapsed = time.perf_counter() - start
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    print(f"  3-sum n={big_n:,} mode=iter : {elapsed * 1e3:8.1f} ms for the first {taken:,} | "
+          f"peak {peak / 2**20:6.1f} MiB")
+    start = time.perf_counter()
+    count = k_sum(big, 4, 4 * big_n - 10, "count")  # near the max: pruning ends it fast
+    print(f"  4-sum n={big_n:,} mode=count, target near max: {(time.perf_counter() - start) * 1e3:8.1f} ms,"
+          f" {count} quadruples")
+
+
+if __name__ == "__main__":
+    import random
+    from itertools import combinations
+
+    assert sorted(map(sorted, Solution().threeSum([-1, 0, 1, 2, -1, -4]))) == [[-1, -1, 2], [-1, 0, 1]]
+    assert Solution().threeSum([0, 0, 0, 0]) == [[0, 0, 0]]
+    assert Solution().kSum([1, 0, -1, 0, -2, 2], 4, 0) == [[-2, -1, 1, 2], [-2, 0, 0, 2], [-1, 0, 0, 1]]
+
+    for _ in range(300):
+        nums = [random.randrange(-8, 8) for _ in range(random.randrange(12))]
+        k = random.randrange(1, 5)
+        target = random.randrange(-10, 10)
+        expected = sorted({c for c in combinations(sorted(nums), k) if sum(c) == target})
+        assert k_sum(nums, k, target) == [list(c) for c in expected]
+        assert list(k_sum(nums, k, target, "iter")) == expected
+        assert k_sum(nums, k, target, "count") == len(expected)
+        if k == 3 and target == 0:
+            assert sorted(sorted(t) for t in Solution().threeSum(list(nums))) == [list(c) for c in expected]
+    print("All tests passed!")
+
+    if len(sys.argv) > 1 and sys.argv[1] == "bench":
+        benchmark_k_sum()
@@ -1,4 +1,11 @@
-from typing import List
+import sys
+import time
+from typing import Any, Callable, List, Optional
+
+try:
+    import numpy as np
+except ImportError:  # NumPy is only needed for the vectorized fast path
+    np = None
 
 
 #code 1
@@ -12,13 +19,14 @@ class Solution:
         for i in range(len(nums)):
             if nums[i] != 0:
                 nums[nextNonZero], nums[i] = nums[i], nums[nextNonZero]
-                nextNonZero += 1 
+                nextNonZero += 1
 
-                            
 
-#Code 2
 
-class Solution:
+#Code 2 - was also named Solution, which silently replaced code 1.
+# Correct, but remove() and append() shift the whole list for every zero: O(n^2).
+
+class SolutionRemoveAppend:
     def moveZeroes(self, nums: List[int]) -> None:
         """
         Do not return anything, modify nums in-place instead.
@@ -34,7 +42,171 @@ class Solution:
             else:
                 l+=1
 
-            
+
 
         return nums
-        
\ No newline at end of file
+
+
+# ============================================================================
+# stable_partition: "move all X to the end" for lists, array.array,
+# bytearray and NumPy arrays, in place
+# ============================================================================
+
+def _partition_sequence(seq, value, pred: Optional[Callable[[Any], bool]]) -> int:
+    """Element-by-element version: works on anything indexable and assignable."""
+    moved = []
+    keep = 0
+    for x in seq:  # reading position >= keep, so writes never clobber unread items
+        if (pred(x) if pred is not None else x == value):
+            if pred is not None:
+                moved.append(x)
+        else:
+            seq[keep] = x
+            keep += 1
+    if pred is None:
+        for i in range(keep, len(seq)):
+            seq[i] = value
+    else:
+        for i, x in enumerate(moved, keep):
+            seq[i] = x
+    return keep
+
+
+def _partition_numpy(arr, value, pred: Optional[Callable], chunk: int) -> int:
+    """
+    Vectorized version on a NumPy view of the caller's buffer. Each chunk's
+    kept elements are compacted to the write position, which never passes
+    the chunk being read. Temporary memory is one chunk, plus the moved
+    elements in predicate mode.
+    """
+    moved = []
+    keep = 0
+    for lo in range(0, len(arr), chunk):
+        part = arr[lo:lo + chunk]
+        out = pred(part) if pred is not None else part == value
+        kept = part[~out]
+        if pred is not None:
+            moved.append(part[out])
+        arr[keep:keep + len(kept)] = kept
+        keep += len(kept)
+    if pred is None:
+        arr[keep:] = value
+    else:
+        pos = keep
+        for block in moved:
+            arr[pos:pos + len(block)] = block
+            pos += len(block)
+    return keep
+
+
+def stable_partition(buf, value: Any = 0, pred: Optional[Callable] = None,
+                     vectorized: bool = False, chunk: int = 1 << 20) -> int:
+    """
+    Move every element equal to `value` - or, with `pred`, every element for
+    which pred(x) is true - to the end of `buf`, in place, keeping the
+    other elements in their original order. Returns how many were kept.
+
+    - list, or any mutable sequence: one O(n) pass
+    - array.array, bytearray, NumPy arrays, or any writable buffer: viewed
+      through memoryview/NumPy without copying. With NumPy this takes the
+      vectorized chunked path, and then `pred`, if given, must take and
+      return arrays (vectorized=True). Without NumPy it is an O(n) pass
+      over the memoryview.
+
+    With `value` the tail is filled with `value`. With `pred` the moved
+    elements keep their order too, at the cost of buffering them.
+    """
+    if pred is not None and not callable(pred):
+        raise TypeError("pred must be callable")
+    if isinstance(buf, list):
+        return _partition_sequence(buf, value, pred)
+    if np is not None and isinstance(buf, np.ndarray):
+        arr = buf.reshape(-1) if buf.flags.c_contiguous else None
+        if arr is None:
+            raise ValueError("stable_partition needs a contiguous array")
+    else:
+        try:
+            view = memoryview(buf)
+        except TypeError:
+            return _partition_sequence(buf, value, pred)
+        if view.readonly:
+            raise TypeError("stable_partition needs a writable buffer")
+        view = view.cast("B").cast(view.format) if view.ndim != 1 else view
+        if np is None or (pred is not None and not vectorized):
+            return _partition_sequence(view, value, pred)
+        arr = np.asarray(view)  # shares memory with buf
+    if pred is not None and not vectorized:
+        # Element-wise predicate on a NumPy array: still in place, just slower
+        return _partition_sequence(arr, value, pred)
+    return _partition_numpy(arr, value, pred, chunk)
+
+
+def benchmark_move_zeroes(n: int = 10_000_000, zero_rate: float = 0.1) -> None:
+    import random
+    from array import array
+    rng = random.Random(0)
+    base = [0 if rng.random() < zero_rate else rng.randrange(1, 1 << 30) for _ in range(n)]
+
+    small = base[:30_000]
+    start = time.perf_counter()
+    SolutionRemoveAppend().moveZeroes(list(small))
+    elapsed = time.perf_counter() - start
+    print(f"  code 2 remove/append    n={len(small):>11,}: {elapsed * 1e3:9.1f} ms "
+          f"(O(n^2): ~{elapsed * (n / len(small)) ** 2 / 3600:.0f} h at n={n:,})")
+
+    runs = [("code 1 swap (list)", list, lambda buf: Solution().moveZeroes(buf)),
+            ("stable_partition list", list, stable_partition),
+            ("stable_partition array", lambda b: array("q", b), stable_partition),
+            ("stable_partition bytes", lambda b: bytearray(x & 0xFF for x in b), stable_partition)]
+    if np is not None:
+        runs.append(("stable_partition numpy", lambda b: np.array(b, dtype=np.int64), stable_partition))
+    for label, make, run in runs:
+        buf = make(base)
+        start = time.perf_counter()
+        run(buf)
+        print(f"  {label:<23} n={n:>11,}: {(time.perf_counter() - start) * 1e3:9.1f} ms")
+
+
+if __name__ == "__main__":
+    import random
+    from array import array
+
+    nums = [0, 1, 0, 3, 12]
+    Solution().moveZeroes(nums)
+    assert nums == [1, 3, 12, 0, 0]
+
+    for _ in range(300):
+        data = [random.randrange(4) for _ in range(random.randrange(40))]
+        value = random.randrange(3)
+        expected = [x for x in data if x != value] + [x for x in data if x == value]
+        odd_last = [x for x in data if x % 2 == 0] + [x for x in data if x % 2]
+
+        lst = list(data)
+        Solution().moveZeroes(lst)
+        assert lst == [x for x in data if x] + [0] * data.count(0)
+        lst = list(data)
+        SolutionRemoveAppend().moveZeroes(lst)
+        assert lst == [x for x in data if x] + [0] * data.count(0)
+
+        chunk = random.choice((1, 3, 1 << 20))
+        for make in (list, lambda d: array("q", d), bytearray):
+            buf = make(data)
+            assert stable_partition(buf, value, chunk=chunk) == len(data) - data.count(value)
+            assert list(buf) == expected
+            buf = make(data)
+            stable_partition(buf, pred=lambda x: x % 2 == 1)
+            assert list(buf) == odd_last
+        if np is not None:
+            buf = np.array(data, dtype=np.int32)
+            stable_partition(buf, value, chunk=chunk)
+            assert buf.tolist() == expected
+            buf = np.array(data, dtype=np.int32)
+            stable_partition(buf, pred=lambda a: a % 2 == 1, vectorized=True, chunk=chunk)
+            assert buf.tolist() == odd_last
+            buf = array("d", data)
+            stable_partition(buf, pred=lambda a: a % 2 == 1, vectorized=True, chunk=chunk)
+            assert buf.tolist() == odd_last
+    print("All tests passed!")
+
+    if len(sys.argv) > 1 and sys.argv[1] == "bench":
+        benchmark_move_zeroes()
@@ -1,8 +1,20 @@
-from typing import List
+import heapq
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from typing import List, Optional, Tuple
+
+try:
+    import numpy as np
+except ImportError:  # NumPy is only needed for the vectorized / file / 2D modes
+    np = None
 
 
 class Solution:
     def trap(self, height: List[int]) -> int:
+        if len(height) < 3:
+            return 0
         l,r = 0, len(height)-1
         left_h = height[l]
         right_h = height[r]
@@ -13,11 +25,227 @@ class Solution:
                 l +=1
                 if height[l] < left_h:
                     total += left_h - height[l]
-                left_h = height[l]
+                left_h = max(left_h, height[l])  # the wall is the highest bar so far, not the last one
 
             else:
                 r-=1
                 if height[r] < right_h:
                     total += right_h - height[r]
-                right_h = height[r]
-        return total
\ No newline at end of file
+                right_h = max(right_h, height[r])
+        return total
+
+
+# ============================================================================
+# 1D, vectorized and out-of-core
+#
+# Water above bar i is min(L[i], R[i]) - h[i], with L the prefix max and R
+# the suffix max. Split into chunks, L inside a chunk is
+# max(highest bar in all earlier chunks, prefix max within the chunk), and
+# R likewise from the right. So two passes give the exact total:
+# 1. every chunk reports its max (in parallel)
+# 2. with the running maxima from both sides as boundary values, every
+#    chunk sums its own water (in parallel)
+# ============================================================================
+
+def _chunk_water(h, left_wall, right_wall) -> int:
+    """Water over one chunk given the highest bars to its left and right."""
+    left = np.maximum.accumulate(h)
+    np.maximum(left, left_wall, out=left)
+    right = np.maximum.accumulate(h[::-1])[::-1]
+    np.maximum(right, right_wall, out=right)
+    np.minimum(left, right, out=left)
+    left -= h
+    return int(left.sum(dtype=np.int64))
+
+
+def trap_numpy(height) -> int:
+    """Solution.trap in one vectorized pass over an in-memory array."""
+    if np is None:
+        raise ImportError("trap_numpy requires NumPy")
+    h = np.asarray(height, dtype=np.int64)
+    if len(h) < 3:
+        return 0
+    return _chunk_water(h, h.min(), h.min())
+
+
+def _open(path: str, dtype: str):
+    return np.memmap(path, dtype=dtype, mode="r")
+
+
+def _file_chunk_max(path: str, dtype: str, lo: int, hi: int):
+    return _open(path, dtype)[lo:hi].max()
+
+
+def _file_chunk_water(path: str, dtype: str, lo: int, hi: int, left_wall, right_wall) -> int:
+    h = np.asarray(_open(path, dtype)[lo:hi], dtype=np.int64)
+    return _chunk_water(h, left_wall, right_wall)
+
+
+def trap_file(path: str, dtype: str = "<i4", chunk_elems: int = 1 << 24,
+              workers: Optional[int] = 1) -> int:
+    """
+    Trapped water for a terrain profile stored as a raw binary array
+    (`dtype` per bar), too large to load. Each chunk is memory-mapped by
+    the process that handles it. Peak memory is a few chunk-sized int64
+    arrays per worker. workers=1 runs in-process; None means one per CPU.
+    """
+    if np is None:
+        raise ImportError("trap_file requires NumPy")
+    n = len(_open(path, dtype)) if os.path.getsize(path) else 0
+    if n < 3:
+        return 0
+    bounds = [(lo, min(lo + chunk_elems, n)) for lo in range(0, n, chunk_elems)]
+    los, his = [lo for lo, _ in bounds], [hi for _, hi in bounds]
+    paths, dtypes = [path] * len(bounds), [dtype] * len(bounds)
+
+    def run(pool_map):
+        maxes = [int(m) for m in pool_map(_file_chunk_max, paths, dtypes, los, his)]
+        no_wall = -(1 << 63)  # lowest int64: below every bar
+        left_walls, right_walls = [no_wall], [no_wall]
+        for m in maxes[:-1]:
+            left_walls.append(max(left_walls[-1], m))
+        for m in maxes[:0:-1]:
+            right_walls.append(max(right_walls[-1], m))
+        right_walls.reverse()
+        return sum(pool_map(_file_chunk_water, paths, dtypes, los, his, left_walls, right_walls))
+
+    if workers == 1 or len(bounds) == 1:
+        return run(map)
+    with ProcessPoolExecutor(workers) as pool:
+        return run(pool.map)
+
+
+# ============================================================================
+# 2D: LeetCode 407 on a NumPy elevation map
+# ============================================================================
+
+def trap_2d(grid) -> int:
+    """
+    Water trapped on a 2D elevation map. Flood inward from the border with a
+    min-heap of (level, cell). The lowest boundary cell decides how high
+    its unvisited neighbours can fill. Each cell is pushed once:
+    O(rows * cols * log(rows + cols)) time.
+    """
+    h = np.asarray(grid, dtype=np.int64) if np is not None else None
+    if h is None:
+        raise ImportError("trap_2d requires NumPy")
+    rows, cols = h.shape if h.ndim == 2 else (0, 0)
+    if rows < 3 or cols < 3:
+        return 0
+    heights = h.ravel().tolist()  # plain ints: much faster to index than a NumPy array
+    visited = bytearray(rows * cols)
+    heap: List[Tuple[int, int]] = []
+    for r in range(rows):
+        for c in (0, cols - 1):
+            heap.append((heights[r * cols + c], r * cols + c))
+            visited[r * cols + c] = 1
+    for c in range(1, cols - 1):
+        for r in (0, rows - 1):
+            heap.append((heights[r * cols + c], r * cols + c))
+            visited[r * cols + c] = 1
+    heapq.heapify(heap)
+
+    total = 0
+    while heap:
+        level, cell = heapq.heappop(heap)
+        r, c = divmod(cell, cols)
+        for nr, nc in ((r - 1, c), (r + 1, c), (r, c - 1), (r, c + 1)):
+            if 0 <= nr < rows and 0 <= nc < cols:
+                nxt = nr * cols + nc
+                if not visited[nxt]:
+                    visited[nxt] = 1
+                    bar = heights[nxt]
+                    if bar < level:
+                        total += level - bar
+                        heapq.heappush(heap, (level, nxt))
+                    else:
+                        heapq.heappush(heap, (bar, nxt))
+    return total
+
+
+def benchmark_trap(n: int = 50_000_000) -> None:
+    import random
+    import tempfile
+    rng = random.Random(0)
+
+    height = [rng.randrange(1000) for _ in range(2_000_000)]
+    start = time.perf_counter()
+    expected = Solution().trap(height)
+    print(f"  Solution.trap  n={len(height):>11,}: {(time.perf_counter() - start) * 1e3:8.1f} ms")
+    if np is None:
+        return
+    start = time.perf_counter()
+    assert trap_numpy(height) == expected
+    print(f"  trap_numpy     n={len(height):>11,}: {(time.perf_counter() - start) * 1e3:8.1f} ms")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "terrain.bin")
+        gen = np.random.default_rng(0)
+        with open(path, "wb") as f:
+            for _ in range(n // 10_000_000):
+                gen.integers(0, 10_000, 10_000_000, dtype=np.int32).astype("<i4").tofile(f)
+        size_mb = os.path.getsize(path) / 2**20
+        for workers in (1, 2):
+            start = time.perf_counter()
+            total = trap_file(path, workers=workers)
+            elapsed = time.perf_counter() - start
+            print(f"  trap_file      n={n:>11,}: {elapsed * 1e3:8.1f} ms, {size_mb / elapsed:6.0f} MB/s "
+                  f"(workers={workers}, total {total:,})")
+
+    grid = gen.integers(0, 1000, (300, 300))
+    start = time.perf_counter()
+    water = trap_2d(grid)
+    print(f"  trap_2d        {grid.shape[0]}x{grid.shape[1]}: {(time.perf_counter() - start) * 1e3:8.1f} ms ({water:,})")
+    print(f"  ({os.cpu_count()} CPU(s))")
+
+
+if __name__ == "__main__":
+    import random
+    import tempfile
+
+    assert Solution().trap([0, 1, 0, 2, 1, 0, 1, 3, 2, 1, 2, 1]) == 6
+    assert Solution().trap([4, 2, 0, 3, 2, 5]) == 9
+    assert Solution().trap([]) == 0
+
+    def brute(h):
+        return sum(max(0, min(max(h[:i + 1]), max(h[i:])) - h[i]) for i in range(len(h)))
+
+    with tempfile.TemporaryDirectory() as tmp:
+        for trial in range(200):
+            height = [random.randrange(8) for _ in range(random.randrange(30))]
+            expected = brute(height)
+            assert Solution().trap(height) == expected
+            if np is None:
+                continue
+            assert trap_numpy(height) == expected
+            path = os.path.join(tmp, f"{trial}.bin")
+            np.array(height, dtype="<i4").tofile(path)
+            assert trap_file(path, chunk_elems=random.randrange(1, 8)) == expected
+            if trial < 2:
+                assert trap_file(path, chunk_elems=3, workers=2) == expected
+
+    if np is not None:
+        assert trap_2d([[1, 4, 3, 1, 3, 2], [3, 2, 1, 3, 2, 4], [2, 3, 3, 2, 3, 1]]) == 4
+        assert trap_2d(np.array([[3, 3, 3, 3, 3], [3, 2, 2, 2, 3], [3, 2, 1, 2, 3],
+                                 [3, 2, 2, 2, 3], [3, 3, 3, 3, 3]])) == 10
+        # Water level by relaxation: border cells drain, inner cells fill to
+        # the lowest level they can spill over
+        for _ in range(50):
+            rows, cols = random.randrange(3, 8), random.randrange(3, 8)
+            g = [[random.randrange(6) for _ in range(cols)] for _ in range(rows)]
+            level = [[g[r][c] if r in (0, rows - 1) or c in (0, cols - 1) else 99 for c in range(cols)]
+                     for r in range(rows)]
+            changed = True
+            while changed:
+                changed = False
+                for r in range(1, rows - 1):
+                    for c in range(1, cols - 1):
+                        lowest = min(level[r - 1][c], level[r + 1][c], level[r][c - 1], level[r][c + 1])
+                        new_level = max(g[r][c], lowest)
+                        if new_level < level[r][c]:
+                            level[r][c], changed = new_level, True
+            assert trap_2d(np.array(g)) == sum(level[r][c] - g[r][c] for r in range(rows) for c in range(cols))
+    print("All tests passed!")
+
+    if len(sys.argv) > 1 and sys.argv[1] == "bench":
+        benchmark_trap()
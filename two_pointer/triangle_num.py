@@ -1,4 +1,15 @@
-from typing import List
+import math
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import shared_memory
+from typing import List, Optional
+
+try:
+    import numpy as np
+except ImportError:  # NumPy is only needed for the vectorized / parallel modes
+    np = None
 
 
 class Solution:
@@ -20,3 +31,161 @@ class Solution:
                     l+=1
         return res
 
+
+# ============================================================================
+# Vectorized counting on the sorted array s
+#
+# For largest side s[i] and middle side s[r] (r < i), the valid smallest
+# sides are the l < r with s[l] > s[i] - s[r]: r - searchsorted(s, s[i] - s[r],
+# "right") of them, or none if that is negative. That is the same count
+# the two-pointer loop adds up, so results match exactly, for any values.
+# Work for largest side i is O(i log n): later i cost more.
+# ============================================================================
+
+def _count_largest(s, lo: int, hi: int, block: int = 1 << 22) -> int:
+    """Triangles whose largest side is s[i] for i in [lo, hi)."""
+    total = 0
+    i = max(lo, 2)
+    while i < hi:
+        # As many largest sides per step as fit in ~block (i, r) cells
+        step = max(1, min(hi - i, block // (2 * i), math.isqrt(block)))
+        largest = s[i:i + step, None]
+        r = np.arange(i + step - 1)
+        counts = r - np.searchsorted(s, largest - s[None, :i + step - 1], side="right")
+        counts[r >= np.arange(i, i + step)[:, None]] = 0  # the middle side must come before i
+        total += int(np.maximum(counts, 0).sum())
+        i += step
+    return total
+
+
+def _count_by_histogram(s) -> int:
+    """
+    Small non-negative ints: count the invalid triples (a + b <= c) from a
+    histogram instead. With positive sides such a c is the strict maximum,
+    so invalid = sum over c of (pairs with a + b <= c), and the pair-sum
+    counts come from one convolution of the histogram with itself.
+    Zero sides never form a triangle and are dropped first. O(n + V^2)
+    for values up to V.
+    """
+    s = s[s > 0]
+    n = len(s)
+    hist = np.bincount(s).astype(np.int64)
+    pairs = np.convolve(hist, hist)  # ordered pairs, including (x, x)
+    pairs[::2][:len(hist)] -= hist  # drop each side paired with itself
+    pairs //= 2
+    at_most = np.cumsum(pairs)[:len(hist)]  # at_most[v] = pairs with sum <= v
+    invalid = sum(h * c for h, c in zip(hist.tolist(), at_most.tolist()))  # exact, no int64 overflow
+    return n * (n - 1) * (n - 2) // 6 - invalid
+
+
+def triangle_number_numpy(nums, max_histogram: int = 1 << 13) -> int:
+    """triangleNumber with NumPy: histogram path for small ints, else searchsorted."""
+    if np is None:
+        raise ImportError("triangle_number_numpy requires NumPy")
+    s = np.sort(np.asarray(nums))
+    if len(s) < 3:
+        return 0
+    if np.issubdtype(s.dtype, np.integer) and s[0] >= 0 and s[-1] <= max_histogram:
+        return _count_by_histogram(s)
+    return _count_largest(s, 2, len(s))
+
+
+def _count_chunk(shm_name: str, n: int, dtype: str, lo: int, hi: int) -> int:
+    shm = shared_memory.SharedMemory(name=shm_name)
+    try:
+        s = np.ndarray((n,), dtype=dtype, buffer=shm.buf)
+        total = _count_largest(s, lo, hi)
+        del s
+        return total
+    finally:
+        shm.close()
+
+
+def balanced_bounds(n: int, chunks: int) -> List[int]:
+    """
+    Split the largest-side range [0, n) into chunks of about equal work.
+    Work up to i grows like i^2, so the cuts are at n * sqrt(j / chunks).
+    """
+    cuts = {min(n, round(n * math.sqrt(j / chunks))) for j in range(chunks + 1)}
+    return sorted(cuts | {0, n})
+
+
+def triangle_number_parallel(nums, workers: Optional[int] = None, chunks_per_worker: int = 4) -> int:
+    """
+    searchsorted counting over a process pool. The sorted array is placed
+    in shared memory once. The largest-side range is cut into
+    cost-balanced chunks, several per worker so stragglers even out.
+    """
+    if np is None:
+        raise ImportError("triangle_number_parallel requires NumPy")
+    s = np.ascontiguousarray(np.sort(np.asarray(nums)))
+    n = len(s)
+    if n < 3:
+        return 0
+    workers = workers or os.cpu_count() or 1
+    bounds = balanced_bounds(n, workers * chunks_per_worker)
+    shm = shared_memory.SharedMemory(create=True, size=s.nbytes)
+    try:
+        np.ndarray(s.shape, dtype=s.dtype, buffer=shm.buf)[:] = s
+        jobs = len(bounds) - 1
+        with ProcessPoolExecutor(workers) as pool:
+            return sum(pool.map(_count_chunk, [shm.name] * jobs, [n] * jobs, [s.dtype.str] * jobs,
+                                bounds[:-1], bounds[1:]))
+    finally:
+        shm.close()
+        shm.unlink()
+
+
+def benchmark_triangle_number() -> None:
+    import random
+    rng = random.Random(0)
+
+    nums = [rng.randrange(1, 1001) for _ in range(3_000)]
+    start = time.perf_counter()
+    expected = Solution().triangleNumber(list(nums))
+    print(f"  triangleNumber       n={len(nums):>7,}: {(time.perf_counter() - start) * 1e3:9.1f} ms")
+    if np is None:
+        return
+    for label, run in (("numpy searchsorted", lambda a: triangle_number_numpy(a, max_histogram=0)),
+                       ("numpy histogram", triangle_number_numpy)):
+        start = time.perf_counter()
+        assert run(nums) == expected
+        print(f"  {label:<20} n={len(nums):>7,}: {(time.perf_counter() - start) * 1e3:9.1f} ms")
+
+    # LeetCode's bounds (values <= 1000) at n = 10^5
+    big = np.array([rng.randrange(0, 1001) for _ in range(100_000)])
+    start = time.perf_counter()
+    count = triangle_number_numpy(big)
+    print(f"  numpy histogram      n={len(big):>7,}: {(time.perf_counter() - start) * 1e3:9.1f} ms ({count:,})")
+
+    # Wide float sides rule out the histogram: searchsorted, serial vs pool
+    wide = np.array([rng.uniform(1, 1e9) for _ in range(20_000)])
+    for label, run in (("numpy searchsorted", triangle_number_numpy),
+                       ("parallel x2", lambda a: triangle_number_parallel(a, 2)),
+                       ("parallel x4", lambda a: triangle_number_parallel(a, 4))):
+        start = time.perf_counter()
+        count = run(wide)
+        print(f"  {label:<20} n={len(wide):>7,}: {(time.perf_counter() - start) * 1e3:9.1f} ms ({count:,})")
+    print(f"  ({os.cpu_count()} CPU(s))")
+
+
+if __name__ == "__main__":
+    import random
+
+    assert Solution().triangleNumber([2, 2, 3, 4]) == 3
+    assert Solution().triangleNumber([4, 2, 3, 4]) == 4
+
+    for trial in range(200):
+        nums = [random.randrange(random.choice((0, -5)), random.choice((4, 30, 2000)))
+                for _ in range(random.randrange(40))]
+        expected = Solution().triangleNumber(list(nums))
+        if np is not None:
+            assert triangle_number_numpy(nums) == expected
+            assert triangle_number_numpy(nums, max_histogram=0) == expected
+            assert _count_largest(np.sort(np.array(nums, dtype=np.int64)), 0, len(nums), block=7) == expected
+            if trial < 3:
+                assert triangle_number_parallel(nums, 2) == expected
+    print("All tests passed!")
+
+    if len(sys.argv) > 1 and sys.argv[1] == "bench":
+        benchmark_triangle_number()